@@ -3,11 +3,29 @@ from tkinter import ttk, messagebox, filedialog
 import json
 import os
 import csv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+import sqlite3
+import struct
+import argparse
+import threading
+import bisect
+import queue
+import gzip
+import heapq
+import hashlib
+import math
+import sys
+import subprocess
+import time
+from array import array
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta, timezone
-from PyQt6.QtWidgets import QMessageBox
-from tkinter import messagebox
+
+# NumPy and matplotlib are heavy, so they load on first use (see load_plotting)
+np = None
+Figure = None
+FigureCanvasTkAgg = None
+NavigationToolbar2Tk = None
 
 
 # ---------------------------
@@ -16,10 +34,54 @@ from tkinter import messagebox
 APP_NAME = "Markyle Fitness Tracker"
 DATA_FILE = "users.json"
 SETTINGS_FILE = "settings.json"
+DB_FILE = "mark_kyle_fitness.db"
+JOURNAL_FILE = "users.journal"
+USERS_DIR = "users"
+USER_INDEX_FILE = "index.json"
+DIRECTORY_FIELDS = ("password", "email")
+JOURNAL_SEQ_KEY = "__journal_seq__"
+JOURNAL_COMPACT_THRESHOLD = 500
+IMPORT_BATCH_SIZE = 1000
+TASK_WORKERS = 4
+BUSY_INDICATOR_DELAY_MS = 300
+AUTOSAVE_WINDOW_MS = 1000
+BACKUP_GENERATIONS = 3
+CHECKSUM_HEADER = '{"sha256":"'
+DATA_FORMATS = ("json", "binary")
+BINARY_MAGIC = b"MKFT"
+BINARY_FORMAT_VERSION = 1
+# magic, version, reserved, SHA-256 of everything after the header
+BINARY_HEADER = struct.Struct("<4sHH32s")
+DATA_BENCH_WORKOUTS = 100_000
+STARTUP_IMPORT_BUDGET_MS = 150
+HEAVY_STARTUP_MODULES = ("numpy", "matplotlib", "PyQt6", "pandas", "pyarrow")
+WORKOUT_FIELDS = ["date", "type", "duration_min", "calories", "notes", "created_at"]
+MEMORY_BENCH_WORKOUTS = 100_000
+MEMORY_REDUCTION_TARGET = 5
+
+# Icon, colour and light background tint for each workout type (dashboard calendar and activities)
+CALENDAR_WORKOUT_ICONS = {
+    "Running": ("🏃", "#10b981", "#d1fae5"),
+    "Cycling": ("🚴", "#3b82f6", "#dbeafe"),
+    "Swimming": ("🏊", "#06b6d4", "#cffafe"),
+    "Weight Training": ("🏋️", "#f97316", "#ffedd5"),
+    "Yoga": ("🧘", "#8b5cf6", "#ede9fe"),
+    "Pilates": ("🤸", "#ec4899", "#fce7f3"),
+    "CrossFit": ("💪", "#ef4444", "#fee2e2"),
+    "Boxing": ("🥊", "#eab308", "#fef9c3"),
+    "Dancing": ("💃", "#f472b6", "#fce7f3"),
+    "Walking": ("🚶", "#84cc16", "#dcfce7"),
+    "Hiking": ("🥾", "#14b8a6", "#ccfbf1"),
+    "Rowing": ("🚣", "#0ea5e9", "#e0f2fe")
+}
+DEFAULT_WORKOUT_ICON = ("💪", "#6366f1", "#e0e7ff")
 
 DEFAULT_SETTINGS = {
     "dark_mode": True,
-    "sidebar_collapsed": False
+    "sidebar_collapsed": False,
+    "storage_backend": "sharded",
+    "autosave_window_ms": AUTOSAVE_WINDOW_MS,
+    "data_format": "json"
 }
 
 
@@ -27,33 +89,3487 @@ DEFAULT_SETTINGS = {
 # Data Utilities
 # ---------------------------
 def load_settings():
-    if not os.path.exists(SETTINGS_FILE):
-        return DEFAULT_SETTINGS.copy()
-    try:
-        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-            s = json.load(f)
-            out = DEFAULT_SETTINGS.copy()
-            out.update(s)
-            return out
-    except:
-        return DEFAULT_SETTINGS.copy()
+    s, _ = load_generations(SETTINGS_FILE)
+    out = DEFAULT_SETTINGS.copy()
+    if isinstance(s, dict):
+        out.update(s)
+    return out
 
 def save_settings(s):
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(s, f, indent=2)
+    write_json_checked(s, SETTINGS_FILE, indent=2)
 
-def load_data():
-    if not os.path.exists(DATA_FILE):
+def load_data(path=DATA_FILE):
+    data, _ = load_generations(path)
+    if not isinstance(data, dict):
         return {}
+    # Snapshots written by the journal backend carry their sequence number
+    data.pop(JOURNAL_SEQ_KEY, None)
+    return data
+
+def save_data(data, path=DATA_FILE, data_format="json"):
+    if data_format == "binary":
+        write_binary_checked(data, path)
+    else:
+        write_json_checked(data, path, indent=2)
+
+def backup_path(path, generation):
+    """path itself for generation 0, then path.1 (newest backup), path.2, ..."""
+    return f"{path}.{generation}" if generation else path
+
+def write_json_checked(data, path, indent=None, generations=BACKUP_GENERATIONS):
+    """Atomically replace path with data, keeping the previous copies as path.1 .. path.N.
+
+    The JSON is wrapped as {"sha256": <digest of the body>, "data": <body>} so a
+    torn or bit-rotted file is detected on load instead of parsing as garbage.
+    """
+    separators = None if indent else (",", ":")
+    body = json.dumps(data, indent=indent, separators=separators, default=json_default)
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    write_with_backups(f'{CHECKSUM_HEADER}{digest}","data":{body}}}'.encode("utf-8"), path, generations)
+
+def write_binary_checked(data, path, generations=BACKUP_GENERATIONS):
+    """write_json_checked for the binary layout: header with the body's digest, then encode_binary()"""
+    body = encode_binary(data)
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, 0, hashlib.sha256(body).digest())
+    write_with_backups(header + body, path, generations)
+
+def write_with_backups(content, path, generations=BACKUP_GENERATIONS):
+    """Swap content (bytes) in at path via a fsynced temp file, rotating the old copies"""
+    tmp_path = path + ".tmp"
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+    except OSError:
+        # Disk full or similar: the current file and its backups stay as they were
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if generations and os.path.exists(path):
+        for generation in range(generations, 1, -1):
+            if os.path.exists(backup_path(path, generation - 1)):
+                os.replace(backup_path(path, generation - 1), backup_path(path, generation))
+        os.replace(path, backup_path(path, 1))
+    os.replace(tmp_path, path)
+    fsync_dir(path)
+
+def fsync_dir(path):
+    """Make the renames durable too (not supported on Windows, where it is skipped)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def read_checked(path):
+    """Read a file written by write_json_checked or write_binary_checked, told apart
+    by the binary magic, or a plain JSON file from older versions.
+
+    Raises ValueError when the checksum does not match or the content is malformed.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(BINARY_MAGIC):
+        if len(raw) < BINARY_HEADER.size:
+            raise ValueError("truncated header")
+        _, version, _, digest = BINARY_HEADER.unpack_from(raw)
+        if version > BINARY_FORMAT_VERSION:
+            raise ValueError(f"binary format version {version} is newer than this app")
+        body = memoryview(raw)[BINARY_HEADER.size:]
+        if hashlib.sha256(body).digest() != digest:
+            raise ValueError("checksum mismatch")
+        try:
+            return decode_binary(body)
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"malformed binary data: {e}") from e
+
+    # Older versions wrote JSON in text mode, so files saved on Windows have CRLF lines
+    text = raw.decode("utf-8").replace("\r\n", "\n")
+    if not text.startswith(CHECKSUM_HEADER):
+        return json.loads(text)
+
+    start = len(CHECKSUM_HEADER)
+    digest = text[start:start + 64]
+    body = text[start + 64 + len('","data":'):-1]
+    if not text.endswith("}") or hashlib.sha256(body.encode("utf-8")).hexdigest() != digest:
+        raise ValueError("checksum mismatch")
+    return json.loads(body)
+
+def load_generations(path, generations=BACKUP_GENERATIONS):
+    """Load path, falling back to the newest intact backup; returns (data, source).
+
+    (None, None) means there is no file at all. If every copy is damaged the
+    main file is moved aside to path.damaged, so the next save cannot bury it.
+    """
+    damaged = False
+    for generation in range(generations + 1):
+        candidate = backup_path(path, generation)
+        if not os.path.exists(candidate):
+            continue
+        try:
+            data = read_checked(candidate)
+        except (OSError, ValueError) as e:
+            print(f"Skipping damaged {candidate}: {e}", file=sys.stderr)
+            damaged = True
+            continue
+        if candidate != path:
+            print(f"Recovered {path} from {candidate}", file=sys.stderr)
+        return data, candidate
+
+    if damaged and os.path.exists(path):
+        os.replace(path, path + ".damaged")
+    return None, None
+
+
+# ---------------------------
+# Lazy Imports
+# ---------------------------
+_import_lock = threading.Lock()
+
+
+def load_numpy():
+    global np
+    with _import_lock:
+        if np is None:
+            import numpy
+            np = numpy
+    return np
+
+
+def prewarm_plotting():
+    """Import the plotting stack without touching Tk; safe to run on a worker thread.
+
+    Returns the (figure, backend_tkagg) modules.
+    """
+    load_numpy()
+    from matplotlib import figure
+    from matplotlib.backends import backend_tkagg
+    return figure, backend_tkagg
+
+
+def load_plotting():
+    """Import matplotlib's Figure and Tk canvas the first time a chart is drawn.
+
+    Charts build Figure objects directly instead of going through pyplot, so
+    pyplot's global figure manager never holds on to them.
+    """
+    global Figure, FigureCanvasTkAgg, NavigationToolbar2Tk
+    if Figure is None:
+        figure, backend_tkagg = prewarm_plotting()
+        FigureCanvasTkAgg = backend_tkagg.FigureCanvasTkAgg
+        NavigationToolbar2Tk = backend_tkagg.NavigationToolbar2Tk
+        Figure = figure.Figure
+
+
+def benchmark_startup_imports(budget_ms=STARTUP_IMPORT_BUDGET_MS):
+    """Time importing this module with -X importtime and check it against the budget.
+
+    Returns (cumulative_ms, slowest, heavy) where slowest lists the ten most
+    expensive imports and heavy lists any HEAVY_STARTUP_MODULES that loaded.
+    """
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    module_name = os.path.splitext(os.path.basename(__file__))[0]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=module_dir,
+        capture_output=True,
+        text=True
+    )
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    timings = []
+    for line in result.stderr.splitlines():
+        parts = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+        timings.append((parts[2].strip(), cumulative_us))
+
+    total_ms = next((us for name, us in timings if name == module_name), 0) / 1000
+    slowest = sorted(timings, key=lambda t: t[1], reverse=True)[:10]
+    heavy = sorted({
+        name.split(".")[0] for name, _ in timings
+        if name.split(".")[0] in HEAVY_STARTUP_MODULES
+    })
+    return total_ms, slowest, heavy
+
+
+# ---------------------------
+# Task Executor
+# ---------------------------
+class Task:
+    """Handle for work submitted to a TaskExecutor"""
+
+    def __init__(self, future, label, on_done, on_error, busy, lane="thread"):
+        self.future = future
+        self.lane = lane
+        self.label = label
+        self.on_done = on_done
+        self.on_error = on_error
+        self.busy = busy
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the task if it has not started, and drop its result either way"""
+        self.cancelled = True
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+
+class TaskExecutor:
+    """Runs blocking work off the Tk thread and hands results back to it.
+
+    Three lanes:
+      thread   general pool for reads and analytics
+      io       one worker, so writes reach storage in the order they were made
+      process  lazily started process pool for CPU-heavy aggregation
+    Finished tasks go onto a thread-safe queue that the Tk loop polls with
+    root.after while anything is outstanding; on_done/on_error then run on
+    the Tk thread. Errors without an on_error go to a messagebox. Tasks
+    submitted with busy=True drive on_busy, which is only switched on once
+    they have been running for BUSY_INDICATOR_DELAY_MS, so quick saves never
+    flash the indicator.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root, workers=TASK_WORKERS, on_busy=None, busy_delay_ms=BUSY_INDICATOR_DELAY_MS):
+        self.root = root
+        self.on_busy = on_busy
+        self.busy_delay_ms = busy_delay_ms
+        self.lanes = {
+            "thread": ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task"),
+            "io": ThreadPoolExecutor(max_workers=1, thread_name_prefix="io")
+        }
+        self.completed = queue.Queue()
+        self.outstanding = set()
+        self.polling = False
+        self.busy_count = 0
+        self.busy_after = None
+        self.busy_shown = False
+
+    def lane(self, name):
+        if name == "process" and name not in self.lanes:
+            # Imported here: pulling in multiprocessing costs startup time
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                # Spawn, never fork: a forked child inherits locks held by other
+                # threads (e.g. _import_lock during prewarm_plotting) and hangs
+                self.lanes[name] = ProcessPoolExecutor(
+                    max_workers=max(1, (os.cpu_count() or 2) - 1),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            except (OSError, NotImplementedError):
+                # No multiprocessing here (e.g. a restricted sandbox); threads still keep the UI free
+                self.lanes[name] = self.lanes["thread"]
+        return self.lanes[name]
+
+    def submit(self, fn, *args, on_done=None, on_error=None, lane="thread", label="Task", busy=False):
+        """Run fn(*args) on a lane; returns a Task"""
+        future = self.lane(lane).submit(fn, *args)
+        task = Task(future, label, on_done, on_error, busy, lane)
+        self.outstanding.add(task)
+        if busy:
+            self.set_busy(1)
+        future.add_done_callback(lambda f: self.completed.put(task))
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.POLL_MS, self.poll)
+        return task
+
+    def poll(self):
+        self.process_completed()
+        if self.outstanding:
+            self.root.after(self.POLL_MS, self.poll)
+        else:
+            self.polling = False
+
+    def process_completed(self):
+        """Deliver every finished task's result on the calling (Tk) thread"""
+        while True:
+            try:
+                task = self.completed.get_nowait()
+            except queue.Empty:
+                return
+            self.outstanding.discard(task)
+            if task.busy:
+                self.set_busy(-1)
+            if task.cancelled or task.future.cancelled():
+                continue
+
+            error = task.future.exception()
+            if error is not None:
+                if task.on_error:
+                    task.on_error(error)
+                else:
+                    messagebox.showerror("Error", f"{task.label} failed: {error}")
+            elif task.on_done:
+                task.on_done(task.future.result())
+
+    def set_busy(self, delta):
+        self.busy_count += delta
+        if self.on_busy is None:
+            return
+        if self.busy_count > 0 and self.busy_after is None and not self.busy_shown:
+            self.busy_after = self.root.after(self.busy_delay_ms, self.show_busy)
+        elif self.busy_count == 0:
+            if self.busy_after is not None:
+                self.root.after_cancel(self.busy_after)
+                self.busy_after = None
+            if self.busy_shown:
+                self.busy_shown = False
+                self.on_busy(False)
+
+    def show_busy(self):
+        self.busy_after = None
+        if self.busy_count > 0:
+            self.busy_shown = True
+            self.on_busy(True)
+
+    def flush(self, lane="io"):
+        """Block until everything queued on a lane has run, then deliver results"""
+        self.lanes[lane].submit(lambda: None).result()
+        self.process_completed()
+
+    def shutdown(self):
+        """Finish queued writes and stop the pools (on exit, after Tk is gone)"""
+        for task in list(self.outstanding):
+            if not task.busy:
+                task.cancel()
+        process = self.lanes.get("process")
+        if process is not None and process is not self.lanes["thread"]:
+            # Only prefetches run here; nothing is lost by abandoning one mid-run. An
+            # idle pool is still joined, which is instant and keeps its exit hook quiet
+            running = any(task.lane == "process" and not task.done() for task in self.outstanding)
+            process.shutdown(wait=not running, cancel_futures=True)
+        for executor in {self.lanes["thread"], self.lanes["io"]}:
+            executor.shutdown(wait=True)
+
+
+def directory_entry(user):
+    """The part of an account the login and registration screens need"""
+    return {field: user.get(field, "") for field in DIRECTORY_FIELDS}
+
+
+def snapshot_data(data):
+    """Copy of the users dict that later edits on the Tk thread cannot reach.
+
+    Workouts are never modified once logged and profiles are replaced
+    wholesale, so copying the containers (not the records) is enough.
+    """
+    snapshot = {}
+    for username, user in data.items():
+        user = dict(user)
+        if "workouts" in user:
+            user["workouts"] = user["workouts"].copy()
+        snapshot[username] = user
+    return snapshot
+
+
+def build_workout_analytics(workouts):
+    """Build and flush WorkoutAnalytics in one go (run in the process pool)"""
+    analytics = WorkoutAnalytics(workouts)
+    analytics.flush()
+    return analytics
+
+
+class SaveScheduler:
+    """Coalesces changes to user data into occasional storage commits.
+
+    Callers mark what changed (a new account, a profile, new workouts) per
+    user. The first mark starts a window_ms timer; everything marked before
+    it fires goes to storage.commit(data, changes) as one write on the
+    executor's io lane, where changes maps username to
+    {"new": bool, "profile": bool, "workouts": [...]}. flush(wait=True)
+    writes immediately and blocks until it is on disk (logout, window close).
+    A commit that fails puts its changes back to be retried with the next
+    one, and failure holds the error until a commit succeeds.
+    """
+
+    def __init__(self, root, tasks, storage, get_data, window_ms=AUTOSAVE_WINDOW_MS):
+        self.root = root
+        self.tasks = tasks
+        self.storage = storage
+        self.get_data = get_data
+        self.window_ms = window_ms
+        self.changes = {}
+        self.timer = None
+        self.commits = 0
+        self.failure = None
+        self.waiting = False
+
+    def change(self, username):
+        change = self.changes.get(username)
+        if change is None:
+            change = self.changes[username] = {"new": False, "profile": False, "workouts": []}
+        if self.timer is None:
+            self.timer = self.root.after(self.window_ms, self.flush)
+        return change
+
+    def mark_user(self, username):
+        self.change(username)["new"] = True
+
+    def mark_profile(self, username):
+        self.change(username)["profile"] = True
+
+    def mark_workouts(self, username, workouts):
+        self.change(username)["workouts"].extend(workouts)
+
+    def pending(self):
+        return bool(self.changes)
+
+    def flush(self, wait=False):
+        """Send everything marked so far to storage.
+
+        With wait=True, block until it has run and return True only when
+        everything marked is on disk.
+        """
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+
+        if self.changes:
+            changes, self.changes = self.changes, {}
+            data = self.get_data()
+            if self.storage.needs_snapshot:
+                data = snapshot_data(data)
+            self.tasks.submit(
+                self.storage.commit,
+                data,
+                changes,
+                on_done=self.committed,
+                on_error=lambda error: self.failed(changes, error),
+                lane="io",
+                label="Saving",
+                busy=True
+            )
+            self.commits += 1
+
+        if wait:
+            # Failures delivered while waiting are the caller's to report
+            self.waiting = True
+            try:
+                self.tasks.flush("io")
+            finally:
+                self.waiting = False
+            return not self.changes and self.failure is None
+        return None
+
+    def committed(self, result):
+        self.failure = None
+
+    def failed(self, changes, error):
+        """Put a failed commit's changes back ahead of anything marked since, and retry later"""
+        for username, change in changes.items():
+            pending = self.changes.get(username)
+            if pending is None:
+                self.changes[username] = change
+            else:
+                pending["new"] |= change["new"]
+                pending["profile"] |= change["profile"]
+                pending["workouts"][:0] = change["workouts"]
+        if self.timer is None:
+            self.timer = self.root.after(self.window_ms, self.flush)
+        if self.failure is None and not self.waiting:
+            messagebox.showerror("Error", f"Saving failed: {error}\n\nYour changes are kept and will be saved again.")
+        self.failure = error
+
+
+# ---------------------------
+# Storage Backends
+# ---------------------------
+class JsonStorage:
+    """Keeps every account in users.json and rewrites the file on each change"""
+    name = "json"
+    # Writes the whole dataset, so background writes need a snapshot of it
+    needs_snapshot = True
+
+    def __init__(self, path=DATA_FILE, data_format="json"):
+        self.path = path
+        self.data_format = data_format
+        self.users = {}
+
+    def load(self):
+        return load_data(self.path)
+
+    def save(self, data):
+        save_data(data, self.path, self.data_format)
+
+    def load_directory(self):
+        # One file holds everything, so the accounts stay parsed for load_user
+        self.users = self.load()
+        return {username: directory_entry(user) for username, user in self.users.items()}
+
+    def load_user(self, username):
+        return self.users.get(username)
+
+    def commit(self, data, changes):
+        """Write a batch of changes (see SaveScheduler): one atomic rewrite"""
+        for username in changes:
+            self.users[username] = data[username]
+        self.save(self.users)
+
+    def close(self):
+        pass
+
+
+class SqliteStorage:
+    """Persists accounts through the tables in mark_kyle_fitness.db.
+
+    Registration, profile edits and new workouts touch only their own rows,
+    so a save costs time in proportion to the change instead of the dataset.
+    """
+    name = "sqlite"
+    needs_snapshot = False
+
+    WORKOUT_COLUMNS = ("date", "type", "duration_min", "calories", "notes", "created_at")
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # Writes run on the app's single io worker after the startup load, so
+        # the connection is shared across threads but never used concurrently
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        # WAL lets the chart queries read while the io worker commits
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.user_ids = {}
+        self.ensure_schema()
+        # One long-lived connection for chart queries, which run on the io worker
+        # after the commits queued before them; its statement cache keeps the
+        # GROUP BY queries prepared between redraws
+        self.reader = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+
+    def ensure_schema(self):
+        """Create the tables on a fresh database and add the columns the app needs"""
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    user_id INTEGER PRIMARY KEY,
+                    height_cm REAL,
+                    weight_kg REAL,
+                    daily_goal INTEGER,
+                    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS workouts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    date TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    duration_min INTEGER NOT NULL,
+                    calories INTEGER,
+                    notes TEXT,
+                    created_at TEXT,
+                    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS reminders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    hhmm TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    active INTEGER DEFAULT 1,
+                    FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+                )""")
+
+            # The original schema has no room for email, per-user settings or
+            # the free-text profile fields, so add them as extra columns
+            self.add_column("users", "email", "TEXT")
+            self.add_column("users", "settings", "TEXT")
+            self.add_column("profiles", "profile_json", "TEXT")
+
+            # Covers every column the chart aggregates read, so they never touch the table
+            self.conn.execute("DROP INDEX IF EXISTS idx_workouts_user_date")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_workouts_user_date_cover "
+                "ON workouts(user_id, date, type, duration_min, calories)"
+            )
+
+    def add_column(self, table, column, col_type):
+        existing = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        if column not in existing:
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+    def is_empty(self):
+        return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+
+    def load(self):
+        data = {}
+        self.user_ids = {}
+        ids_to_names = {}
+
+        for user_id, username, password, email, settings in self.conn.execute(
+            "SELECT id, username, password_hash, email, settings FROM users"
+        ):
+            self.user_ids[username] = user_id
+            ids_to_names[user_id] = username
+            data[username] = {
+                "password": password,
+                "email": email or "",
+                "profile": {},
+                "workouts": [],
+                "settings": json.loads(settings) if settings else {}
+            }
+
+        for user_id, height, weight, profile_json in self.conn.execute(
+            "SELECT user_id, height_cm, weight_kg, profile_json FROM profiles"
+        ):
+            username = ids_to_names.get(user_id)
+            if username is None:
+                continue
+            data[username]["profile"] = self.profile_from_row(height, weight, profile_json)
+
+        for row in self.conn.execute(
+            "SELECT user_id, date, type, duration_min, calories, notes, created_at "
+            "FROM workouts ORDER BY user_id, id"
+        ):
+            username = ids_to_names.get(row[0])
+            if username is None:
+                continue
+            data[username]["workouts"].append(dict(zip(self.WORKOUT_COLUMNS, row[1:])))
+
+        return data
+
+    def save(self, data):
+        """Write the full dataset, replacing whatever the database held"""
+        with self.conn:
+            self.conn.execute("DELETE FROM workouts")
+            self.conn.execute("DELETE FROM profiles")
+            self.conn.execute("DELETE FROM users")
+            self.user_ids = {}
+            for username, user in data.items():
+                self.insert_user(username, user)
+                self.upsert_profile(username, user.get("profile", {}))
+                self.insert_workouts(username, user.get("workouts", []))
+
+    def load_directory(self):
+        directory = {}
+        self.user_ids = {}
+        for user_id, username, password, email in self.conn.execute(
+            "SELECT id, username, password_hash, email FROM users"
+        ):
+            self.user_ids[username] = user_id
+            directory[username] = {"password": password, "email": email or ""}
+        return directory
+
+    def load_user(self, username):
+        row = self.conn.execute(
+            "SELECT id, password_hash, email, settings FROM users WHERE username = ?",
+            (username,)
+        ).fetchone()
+        if row is None:
+            return None
+        user_id, password, email, settings = row
+        self.user_ids[username] = user_id
+
+        profile_row = self.conn.execute(
+            "SELECT height_cm, weight_kg, profile_json FROM profiles WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+        workouts = self.conn.execute(
+            "SELECT date, type, duration_min, calories, notes, created_at "
+            "FROM workouts WHERE user_id = ? ORDER BY id",
+            (user_id,)
+        )
+        return {
+            "password": password,
+            "email": email or "",
+            "profile": self.profile_from_row(*profile_row) if profile_row else {},
+            "workouts": [dict(zip(self.WORKOUT_COLUMNS, workout)) for workout in workouts],
+            "settings": json.loads(settings) if settings else {}
+        }
+
+    @staticmethod
+    def profile_from_row(height, weight, profile_json):
+        if profile_json:
+            return json.loads(profile_json)
+        return {
+            "height": "" if height is None else str(height),
+            "weight": "" if weight is None else str(weight)
+        }
+
+    def commit(self, data, changes):
+        """Write a batch of changes (see SaveScheduler) in one transaction"""
+        with self.conn:
+            for username, change in changes.items():
+                user = data[username]
+                if change["new"]:
+                    self.insert_user(username, user)
+                if change["new"] or change["profile"]:
+                    self.upsert_profile(username, user.get("profile", {}))
+                if change["workouts"]:
+                    self.insert_workouts(username, change["workouts"])
+
+    def iter_workouts(self, username, start=None, end=None, workout_type=None):
+        """Stream a user's workouts in date order straight from the database.
+
+        Opens its own connection so it can run on a worker thread.
+        """
+        query = (
+            "SELECT w.date, w.type, w.duration_min, w.calories, w.notes, w.created_at "
+            "FROM workouts w JOIN users u ON u.id = w.user_id WHERE u.username = ?"
+        )
+        params = [username]
+        if start:
+            query += " AND w.date >= ?"
+            params.append(start)
+        if end:
+            query += " AND w.date <= ?"
+            params.append(end)
+        if workout_type:
+            query += " AND w.type = ?"
+            params.append(workout_type)
+        query += " ORDER BY w.date, w.id"
+
+        conn = sqlite3.connect(self.path)
+        try:
+            for row in conn.execute(query, params):
+                yield dict(zip(self.WORKOUT_COLUMNS, row))
+        finally:
+            conn.close()
+
+    def workout_queries(self, username):
+        """Chart aggregates for one user, run as SQL on the shared read connection"""
+        return WorkoutQueries(self.reader, username)
+
+    def get_user_id(self, username):
+        if username not in self.user_ids:
+            row = self.conn.execute(
+                "SELECT id FROM users WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown user: {username}")
+            self.user_ids[username] = row[0]
+        return self.user_ids[username]
+
+    def insert_user(self, username, user):
+        cur = self.conn.execute(
+            "INSERT INTO users (username, password_hash, email, settings) VALUES (?, ?, ?, ?)",
+            (
+                username,
+                user.get("password", ""),
+                user.get("email", ""),
+                json.dumps(user.get("settings", {}))
+            )
+        )
+        self.user_ids[username] = cur.lastrowid
+
+    def upsert_profile(self, username, profile):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profiles (user_id, height_cm, weight_kg, profile_json) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                self.get_user_id(username),
+                to_float(profile.get("height")),
+                to_float(profile.get("weight")),
+                json.dumps(profile)
+            )
+        )
+
+    def insert_workouts(self, username, workouts):
+        user_id = self.get_user_id(username)
+        self.conn.executemany(
+            "INSERT INTO workouts (user_id, date, type, duration_min, calories, notes, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (user_id,) + tuple(w.get(col) for col in self.WORKOUT_COLUMNS)
+                for w in workouts
+            ]
+        )
+
+    def close(self):
+        self.reader.close()
+        self.conn.close()
+
+
+class JournalStorage:
+    """Appends each change to users.journal and folds it into users.json later.
+
+    Every registration, profile edit or batch of workouts becomes one compact
+    line in the journal, so a save is a single append. Once the journal holds
+    JOURNAL_COMPACT_THRESHOLD records it is handed to a background thread that
+    rewrites the users.json snapshot atomically. Records carry a sequence
+    number and the snapshot remembers the last one it contains, so replaying
+    snapshot + journal on startup never applies a record twice.
+    """
+    name = "journal"
+    needs_snapshot = False
+
+    def __init__(self, path=DATA_FILE, journal_path=JOURNAL_FILE,
+                 compact_threshold=JOURNAL_COMPACT_THRESHOLD):
+        self.path = path
+        self.journal_path = journal_path
+        self.compacting_path = journal_path + ".compacting"
+        self.compact_threshold = compact_threshold
+        self.lock = threading.Lock()
+        self.journal = None
+        self.compactor = None
+        self.compact_error = None
+        self.seq = 0
+        self.pending = 0
+        self.users = {}
+
+    def load(self):
+        self.wait_for_compactor()
+        with self.lock:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+
+            self.drop_torn_tail(self.journal_path)
+            data, self.seq = self.read_snapshot()
+            data, self.seq, compacting_count = self.replay(data, self.seq, self.compacting_path)
+            data, self.seq, journal_count = self.replay(data, self.seq, self.journal_path)
+
+            if compacting_count:
+                # A previous compaction never finished: fold everything now
+                self.write_snapshot(data, self.seq)
+                os.remove(self.compacting_path)
+                open(self.journal_path, "w", encoding="utf-8").close()
+                journal_count = 0
+
+            self.pending = journal_count
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+        return data
+
+    def save(self, data):
+        """Write a full snapshot and start a fresh journal"""
+        self.wait_for_compactor()
+        with self.lock:
+            if self.journal:
+                self.journal.close()
+            self.write_snapshot(data, self.seq)
+            self.journal = open(self.journal_path, "w", encoding="utf-8")
+            self.pending = 0
+
+    def load_directory(self):
+        # Snapshot + journal replay yields every account, so they stay parsed for load_user
+        self.users = self.load()
+        return {username: directory_entry(user) for username, user in self.users.items()}
+
+    def load_user(self, username):
+        return self.users.get(username)
+
+    def commit(self, data, changes):
+        """Write a batch of changes (see SaveScheduler): at most two records per user"""
+        for username, change in changes.items():
+            user = data[username]
+            if change["new"]:
+                self.users[username] = user
+                # The batch's workouts follow in their own record
+                record = dict(user, workouts=[])
+                self.append({"op": "user", "user": username, "record": record})
+            elif change["profile"]:
+                self.append({"op": "profile", "user": username, "profile": user.get("profile", {})})
+            if change["workouts"]:
+                self.append({"op": "workouts", "user": username, "workouts": list(change["workouts"])})
+
+    def append(self, record):
+        with self.lock:
+            if self.journal is None:
+                self.journal = open(self.journal_path, "a", encoding="utf-8")
+            self.seq += 1
+            record["seq"] = self.seq
+            self.journal.write(json.dumps(record, separators=(",", ":"), default=json_default) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            self.pending += 1
+
+            if self.pending >= self.compact_threshold and not self.compacting():
+                self.start_compaction()
+
+    def compacting(self):
+        return self.compactor is not None and self.compactor.is_alive()
+
+    def start_compaction(self):
+        """Hand the current journal to the compactor and open an empty one (lock held).
+
+        A .compacting file left by a compactor that failed still holds
+        records the snapshot lacks, so it is folded first and the journal is
+        only rotated on a later append, once that has worked.
+        """
+        if not os.path.exists(self.compacting_path):
+            self.journal.close()
+            os.replace(self.journal_path, self.compacting_path)
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+            self.pending = 0
+        self.compactor = threading.Thread(target=self.run_compactor, name="journal-compactor")
+        self.compactor.start()
+
+    def run_compactor(self):
+        try:
+            self.compact()
+        except Exception as e:
+            # The records stay in .compacting; wait_for_compactor raises this
+            print(f"Journal compaction failed: {e}", file=sys.stderr)
+            self.compact_error = e
+
+    def compact(self):
+        # Works purely from disk, so it never touches the app's live data
+        data, seq = self.read_snapshot()
+        data, seq, _ = self.replay(data, seq, self.compacting_path)
+        self.write_snapshot(data, seq)
+        os.remove(self.compacting_path)
+
+    def wait_for_compactor(self):
+        """Join the compactor; raises the error it failed with, if any"""
+        if self.compactor is not None:
+            self.compactor.join()
+            self.compactor = None
+        if self.compact_error is not None:
+            error, self.compact_error = self.compact_error, None
+            raise error
+
+    @staticmethod
+    def drop_torn_tail(journal_path):
+        """Cut off a half-written last record so new appends start on a clean line"""
+        if not os.path.exists(journal_path):
+            return
+        with open(journal_path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def read_snapshot(self):
+        data, _ = load_generations(self.path)
+        if not isinstance(data, dict):
+            return {}, 0
+        seq = data.pop(JOURNAL_SEQ_KEY, 0)
+        return data, seq
+
+    def write_snapshot(self, data, seq):
+        snapshot = dict(data)
+        snapshot[JOURNAL_SEQ_KEY] = seq
+        write_json_checked(snapshot, self.path)
+
+    @staticmethod
+    def replay(data, seq, journal_path):
+        """Apply every complete record newer than seq; returns (data, seq, applied)"""
+        applied = 0
+        if not os.path.exists(journal_path):
+            return data, seq, applied
+
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-append leaves a torn last line; nothing follows it
+                    break
+                if record.get("seq", 0) <= seq:
+                    continue
+                JournalStorage.apply(data, record)
+                seq = record["seq"]
+                applied += 1
+        return data, seq, applied
+
+    @staticmethod
+    def apply(data, record):
+        op = record.get("op")
+        username = record.get("user")
+        if op == "user":
+            data[username] = record["record"]
+        elif op == "profile":
+            data.setdefault(username, {"password": "", "profile": {}, "workouts": [], "settings": {}})
+            data[username]["profile"] = record["profile"]
+        elif op == "workouts":
+            data.setdefault(username, {"password": "", "profile": {}, "workouts": [], "settings": {}})
+            data[username].setdefault("workouts", []).extend(record["workouts"])
+
+    def close(self):
+        self.wait_for_compactor()
+        with self.lock:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+
+
+class ShardedStorage:
+    """One users/<name>.json file per account, plus a small users/index.json.
+
+    The index holds only the directory entries the login and registration
+    screens need (password and email) and each shard's file name.
+    load_directory() reads just the index; a user's profile and workouts are
+    read by load_user() once they log in, and a commit rewrites only the
+    shards of users that changed, so one user's workouts never cost a
+    rewrite of everyone else's.
+    """
+    name = "sharded"
+    # Shards are dumped on the io thread while the Tk thread keeps editing
+    needs_snapshot = True
+
+    def __init__(self, directory=USERS_DIR, data_format="json"):
+        self.directory = directory
+        self.data_format = data_format
+        self.index_path = os.path.join(directory, USER_INDEX_FILE)
+        self.index = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def is_empty(self):
+        return not os.path.exists(self.index_path)
+
+    def load(self):
+        self.load_directory()
+        data = {}
+        for username in self.index:
+            user = self.load_user(username)
+            if user is not None:
+                data[username] = user
+        return data
+
+    def save(self, data):
+        changed = False
+        for username in data:
+            changed |= self.write_user(data, username)
+        if changed:
+            self.write_index()
+
+    def load_directory(self):
+        index, _ = load_generations(self.index_path)
+        self.index = index if isinstance(index, dict) else {}
+        return {username: directory_entry(entry) for username, entry in self.index.items()}
+
+    def load_user(self, username):
+        if username not in self.index:
+            return None
+        user, _ = load_generations(self.shard_path(username))
+        return user if isinstance(user, dict) else None
+
+    def commit(self, data, changes):
+        """Write a batch of changes (see SaveScheduler): one shard per changed user"""
+        changed = False
+        for username in changes:
+            changed |= self.write_user(data, username)
+        if changed:
+            self.write_index()
+
+    @staticmethod
+    def shard_name(username):
+        # Usernames are free text: keep a readable prefix, the digest keeps it unique
+        prefix = "".join(c for c in username if c.isalnum())[:32]
+        digest = hashlib.sha1(username.encode("utf-8")).hexdigest()[:10]
+        return f"{prefix}-{digest}.json"
+
+    def shard_path(self, username):
+        return os.path.join(self.directory, self.index[username]["shard"])
+
+    def write_user(self, data, username):
+        """Rewrite one shard; returns True when the index entry changed with it"""
+        user = data[username]
+        entry = self.index.get(username)
+        if entry is None:
+            entry = {"shard": self.shard_name(username)}
+        updated = dict(entry, **directory_entry(user))
+
+        save_data(user, os.path.join(self.directory, updated["shard"]), self.data_format)
+        if updated == entry:
+            return False
+        self.index[username] = updated
+        return True
+
+    def write_index(self):
+        write_json_checked(dict(self.index), self.index_path, indent=2)
+
+    def close(self):
+        pass
+
+
+STORAGE_BACKENDS = {
+    "json": JsonStorage,
+    "sqlite": SqliteStorage,
+    "journal": JournalStorage,
+    "sharded": ShardedStorage
+}
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def migrate_json_to_sqlite(json_path=DATA_FILE, db_path=DB_FILE):
+    """One-shot copy of every account in users.json into the SQLite database"""
+    data = load_data(json_path)
+    storage = SqliteStorage(db_path)
+    try:
+        storage.save(data)
+    finally:
+        storage.close()
+    return len(data)
+
+
+def convert_data_files(data_format):
+    """Rewrite users.json and every user shard in data_format ("json" or "binary").
+
+    Shards are converted one account at a time, so memory stays at one
+    user's data. Returns the number of files written.
+    """
+    converted = 0
+    if os.path.exists(DATA_FILE):
+        save_data(load_data(DATA_FILE), DATA_FILE, data_format)
+        converted += 1
+
+    if os.path.exists(os.path.join(USERS_DIR, USER_INDEX_FILE)):
+        storage = ShardedStorage(data_format=data_format)
+        for username in storage.load_directory():
+            user = storage.load_user(username)
+            if user is not None:
+                storage.write_user({username: user}, username)
+                converted += 1
+    return converted
+
+
+def get_storage(settings):
+    """Open the storage backend selected by the "storage_backend" setting"""
+    backend = settings.get("storage_backend", "sharded")
+    storage_cls = STORAGE_BACKENDS.get(backend, JsonStorage)
+    if storage_cls in (JsonStorage, ShardedStorage):
+        storage = storage_cls(data_format=settings.get("data_format", "json"))
+    else:
+        storage = storage_cls()
+
+    # First start on SQLite or shards: bring the existing accounts over from users.json
+    if storage_cls in (SqliteStorage, ShardedStorage) and storage.is_empty() and os.path.exists(DATA_FILE):
+        storage.save(load_data())
+
+    return storage
+
+
+# ---------------------------
+# Workout Records
+# ---------------------------
+UNIX_EPOCH = datetime(1970, 1, 1)
+NO_TIMESTAMP = -(2 ** 63)
+INT32_RANGE = range(-(2 ** 31), 2 ** 31)
+WORKOUT_FIELD_SET = frozenset(WORKOUT_FIELDS)
+
+
+class WorkoutLog:
+    """Compact, append-only store of one user's workouts.
+
+    Replaces the list of six-key dicts. Each column is an array: dates as
+    day ordinals, types as ids into this log's own type_names, durations and
+    calories as int32 and created_at as epoch seconds (UTC, so sub-second
+    precision is dropped). Notes are kept only for the workouts that have
+    any. A workout that does not fit these columns (an unparsed date, a
+    missing number, extra keys) is kept as its original dict in irregular.
+
+    Columns only ever grow, so a view's row stays valid; order holds the rows
+    sorted by (date, created_at) and is kept that way on insert, by bisect
+    for a single workout and by a merge for a batch. Indexing and iteration
+    follow order and hand out Workout views, which answer get() and [] with
+    the usual workout keys, so views written against dicts keep working.
+    Workouts without a usable date sort first.
+    """
+
+    def __init__(self, workouts=()):
+        self.order = array("i")
+        self.days = array("i")
+        self.types = array("I")
+        self.durations = array("i")
+        self.calories = array("i")
+        self.created = array("q")
+        self.type_names = []
+        self.type_ids = {}
+        self.notes = {}
+        self.irregular = {}
+        self.extend(workouts)
+
+    def __len__(self):
+        return len(self.days)
+
+    def __iter__(self):
+        for row in self.order:
+            yield Workout(self, row)
+
+    def __getitem__(self, position):
+        """Workout view(s) by position in date order"""
+        if isinstance(position, slice):
+            return [Workout(self, row) for row in self.order[position]]
+        return Workout(self, self.order[position])
+
+    def append(self, workout):
+        """Add one workout (a dict or a Workout view); returns its view"""
+        return self.extend([workout])[0]
+
+    def extend(self, workouts):
+        """Add workouts, keeping date order; returns their views in the order given"""
+        rows = [self.store(workout) for workout in workouts]
+        if not rows:
+            return []
+
+        key = self.sort_key
+        added = sorted(rows, key=key)
+        if not self.order or key(added[0]) >= key(self.order[-1]):
+            # Logged after everything else (the usual case): no reordering at all
+            self.order.extend(added)
+        elif len(added) == 1:
+            bisect.insort(self.order, added[0], key=key)
+        else:
+            self.order = array("i", heapq.merge(self.order, added, key=key))
+        return [Workout(self, row) for row in rows]
+
+    def added_since(self, count):
+        """Views of the workouts stored after the first count, in the order they were added"""
+        return [Workout(self, row) for row in range(count, len(self.days))]
+
+    def sort_key(self, row):
+        return self.days[row], self.created[row]
+
+    def store(self, workout):
+        """Write workout into the columns; returns its row"""
+        row = len(self.days)
+        columns = self.encode(workout)
+        if columns is None:
+            workout = workout.to_dict() if isinstance(workout, Workout) else dict(workout)
+            self.irregular[row] = workout
+            # The columns still carry what sorting needs
+            columns = (parse_day(workout.get("date")), 0, 0, 0, parse_created(workout.get("created_at")), "")
+
+        day, type_id, duration, calories, created, notes = columns
+        self.days.append(day)
+        self.types.append(type_id)
+        self.durations.append(duration)
+        self.calories.append(calories)
+        self.created.append(created)
+        if notes:
+            self.notes[row] = notes
+        return row
+
+    def copy(self, notes=True):
+        """Independent copy of the log; notes=False leaves notes out (chart analytics never read them)"""
+        log = WorkoutLog.__new__(WorkoutLog)
+        for name in ("order", "days", "types", "durations", "calories", "created"):
+            setattr(log, name, array(getattr(self, name).typecode, getattr(self, name)))
+        log.type_names = list(self.type_names)
+        log.type_ids = dict(self.type_ids)
+        log.notes = dict(self.notes) if notes else {}
+        log.irregular = dict(self.irregular)
+        return log
+
+    def encode(self, workout):
+        """The column values for workout, or None if it has to stay a dict"""
+        if isinstance(workout, dict) and not workout.keys() <= WORKOUT_FIELD_SET:
+            return None
+
+        day_text = workout.get("date")
+        try:
+            day = date.fromisoformat(day_text)
+        except (TypeError, ValueError):
+            return None
+        if day.isoformat() != day_text:
+            return None
+
+        duration = workout.get("duration_min")
+        calories = workout.get("calories")
+        # bool is an int subclass; a True duration must come back as True
+        if type(duration) is not int or type(calories) is not int:
+            return None
+        if duration not in INT32_RANGE or calories not in INT32_RANGE:
+            return None
+
+        workout_type = workout.get("type", "")
+        notes = workout.get("notes", "")
+        if not isinstance(workout_type, str) or not isinstance(notes, str):
+            return None
+
+        created_text = workout.get("created_at")
+        if created_text is None:
+            created = NO_TIMESTAMP
+        else:
+            try:
+                created_dt = datetime.fromisoformat(created_text)
+            except (TypeError, ValueError):
+                return None
+            if created_dt.tzinfo is not None:
+                return None
+            created = int((created_dt - UNIX_EPOCH).total_seconds())
+
+        type_id = self.type_ids.get(workout_type)
+        if type_id is None:
+            type_id = self.type_ids[workout_type] = len(self.type_names)
+            self.type_names.append(workout_type)
+
+        return day.toordinal(), type_id, duration, calories, created, notes
+
+    def value(self, row, key, default=None):
+        irregular = self.irregular.get(row)
+        if irregular is not None:
+            return irregular.get(key, default)
+        if key == "date":
+            return date.fromordinal(self.days[row]).isoformat()
+        if key == "type":
+            return self.type_names[self.types[row]]
+        if key == "duration_min":
+            return self.durations[row]
+        if key == "calories":
+            return self.calories[row]
+        if key == "notes":
+            return self.notes.get(row, "")
+        if key == "created_at":
+            created = self.created[row]
+            if created == NO_TIMESTAMP:
+                return None
+            return (UNIX_EPOCH + timedelta(seconds=created)).isoformat()
+        return default
+
+    def row_dict(self, row):
+        irregular = self.irregular.get(row)
+        if irregular is not None:
+            return dict(irregular)
+        return {field: self.value(row, field) for field in WORKOUT_FIELDS}
+
+    def to_dicts(self):
+        # Saved in date order, so the next load's sort has nothing to do
+        return [self.row_dict(row) for row in self.order]
+
+
+class Workout:
+    """View of one WorkoutLog row, read like the workout dict it replaces"""
+    __slots__ = ("log", "row")
+
+    MISSING = object()
+
+    def __init__(self, log, row):
+        self.log = log
+        self.row = row
+
+    def get(self, key, default=None):
+        return self.log.value(self.row, key, default)
+
+    def __getitem__(self, key):
+        value = self.log.value(self.row, key, self.MISSING)
+        if value is self.MISSING:
+            raise KeyError(key)
+        return value
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def to_dict(self):
+        return self.log.row_dict(self.row)
+
+    def __repr__(self):
+        return f"Workout({self.to_dict()!r})"
+
+
+class LogRows:
+    """An array of WorkoutLog rows read as a sequence of Workout views.
+
+    WorkoutIndex keeps a bare row array per day over a log and wraps it in
+    one of these when the day is read, so views are made as rows are read
+    and none are kept.
+    """
+    __slots__ = ("log", "rows")
+
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        log = self.log
+        for row in self.rows:
+            yield Workout(log, row)
+
+    def __reversed__(self):
+        log = self.log
+        for row in reversed(self.rows):
+            yield Workout(log, row)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [Workout(self.log, row) for row in self.rows[position]]
+        return Workout(self.log, self.rows[position])
+
+
+def parse_day(text):
+    """Day ordinal of an ISO date string, or 0 when it does not parse"""
+    try:
+        return date.fromisoformat(text).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_created(text):
+    """Epoch seconds of a created_at string, or NO_TIMESTAMP when it does not parse"""
+    try:
+        created = datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        return NO_TIMESTAMP
+    if created.tzinfo is not None:
+        created = created.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((created - UNIX_EPOCH).total_seconds())
+
+
+def json_default(value):
+    """json.dumps hook that writes compact workout records out as plain dicts"""
+    if isinstance(value, WorkoutLog):
+        return value.to_dicts()
+    if isinstance(value, Workout):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def synthetic_workouts(count):
+    """count workout dicts shaped like the ones the app logs, about three a day up to today"""
+    types = ["Running", "Cycling", "Weight Training", "Yoga", "Swimming", "Walking"]
+    first_day = date.today() - timedelta(days=count // 3)
+    created = datetime(2020, 1, 1)
+    workouts = []
+    for i in range(count):
+        created += timedelta(seconds=3607 + i % 1000, microseconds=i % 999983)
+        workouts.append({
+            "date": (first_day + timedelta(days=i // 3)).isoformat(),
+            "type": types[i % len(types)],
+            "duration_min": 15 + i % 120,
+            "calories": 50 + (i * 37) % 1200,
+            "notes": "",
+            "created_at": created.isoformat()
+        })
+    return workouts
+
+
+def benchmark_workout_memory(count=MEMORY_BENCH_WORKOUTS):
+    """Resident bytes per workout after login: dicts vs. a WorkoutLog, each with its WorkoutIndex.
+
+    Builds count workouts shaped like the ones the app logs, parses them
+    from JSON the way storage loads them, then measures each representation
+    with tracemalloc. The index is counted on both sides because it stays
+    resident too: lists of the dicts on one side, arrays of log rows on the
+    other.
+    Returns {"dicts": (records, index), "compact": (records, index)} in
+    bytes per workout.
+    """
+    import tracemalloc  # benchmark only; keep it off the startup path
+
+    text = json.dumps(synthetic_workouts(count))
+
+    def measure(build):
+        start = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, (tracemalloc.get_traced_memory()[0] - start) / count
+
+    tracemalloc.start()
+    try:
+        parsed, dict_bytes = measure(lambda: json.loads(text))
+        dict_index, dict_index_bytes = measure(lambda: WorkoutIndex(parsed))
+        del dict_index
+        log, compact_bytes = measure(lambda: WorkoutLog(parsed))
+        compact_index, compact_index_bytes = measure(lambda: WorkoutIndex(log))
+    finally:
+        tracemalloc.stop()
+
+    assert len(log) == len(parsed) == len(compact_index)
+    return {"dicts": (dict_bytes, dict_index_bytes), "compact": (compact_bytes, compact_index_bytes)}
+
+
+# ---------------------------
+# Binary Data Format
+# ---------------------------
+# Replaces a workouts list in the JSON part of a binary file; the value is the block number
+BINARY_BLOCK_KEY = "__workout_block__"
+# rows, type names, notes, bytes of irregular-workout JSON
+BINARY_BLOCK_HEADER = struct.Struct("<IIII")
+UINT32 = struct.Struct("<I")
+
+
+def encode_binary(data):
+    """Pack users data (all users, one user's shard or a snapshot) into bytes.
+
+    Layout, all little-endian: the data as compact JSON with every
+    "workouts" list replaced by {BINARY_BLOCK_KEY: n}; a string table (type
+    names and notes); then one block per workouts list holding a WorkoutLog's
+    columns as raw arrays, in date order. Loading a block is a handful of
+    array.frombytes calls instead of parsing a dict per workout.
+    """
+    strings = []
+    string_ids = {}
+    logs = []
+
+    def intern(text):
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(strings)
+            strings.append(text)
+        return string_id
+
+    def strip(value):
+        if not isinstance(value, dict):
+            return value
+        out = {}
+        for key, item in value.items():
+            if key == "workouts" and isinstance(item, (list, WorkoutLog)):
+                out[key] = {BINARY_BLOCK_KEY: len(logs)}
+                logs.append(item if isinstance(item, WorkoutLog) else WorkoutLog(item))
+            else:
+                out[key] = strip(item)
+        return out
+
+    meta = json.dumps(strip(data), separators=(",", ":"), default=json_default).encode("utf-8")
+    blocks = [pack_workout_block(log, intern) for log in logs]
+
+    parts = [UINT32.pack(len(meta)), meta, UINT32.pack(len(strings))]
+    for text in strings:
+        encoded = text.encode("utf-8")
+        parts.append(UINT32.pack(len(encoded)))
+        parts.append(encoded)
+    parts.append(UINT32.pack(len(blocks)))
+    parts.extend(blocks)
+    return b"".join(parts)
+
+
+def decode_binary(buffer):
+    """Inverse of encode_binary; workouts lists come back as WorkoutLogs"""
+    (meta_size,) = UINT32.unpack_from(buffer, 0)
+    offset = UINT32.size
+    meta = json.loads(bytes(buffer[offset:offset + meta_size]))
+    offset += meta_size
+
+    (string_count,) = UINT32.unpack_from(buffer, offset)
+    offset += UINT32.size
+    strings = []
+    for _ in range(string_count):
+        (size,) = UINT32.unpack_from(buffer, offset)
+        offset += UINT32.size
+        strings.append(str(buffer[offset:offset + size], "utf-8"))
+        offset += size
+
+    (block_count,) = UINT32.unpack_from(buffer, offset)
+    offset += UINT32.size
+    logs = []
+    for _ in range(block_count):
+        log, offset = unpack_workout_block(buffer, offset, strings)
+        logs.append(log)
+
+    def restore(value):
+        if not isinstance(value, dict):
+            return value
+        if len(value) == 1 and BINARY_BLOCK_KEY in value:
+            return logs[value[BINARY_BLOCK_KEY]]
+        return {key: restore(item) for key, item in value.items()}
+
+    return restore(meta)
+
+
+def little_endian(column):
+    if sys.byteorder == "little":
+        return column.tobytes()
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def read_column(buffer, offset, typecode, count):
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    if end > len(buffer):
+        raise IndexError("block runs past the end of the data")
+    column.frombytes(buffer[offset:end])
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column, end
+
+
+def pack_workout_block(log, intern):
+    """One WorkoutLog's columns, rewritten in date order, plus its notes and irregular rows"""
+    count = len(log.order)
+    columns = [log.days, log.types, log.durations, log.calories, log.created]
+    if log.order == array("i", range(count)):
+        position = None
+    else:
+        columns = [array(column.typecode, (column[row] for row in log.order)) for column in columns]
+        position = array("i", bytes(4 * count))
+        for pos, row in enumerate(log.order):
+            position[row] = pos
+
+    def at(row):
+        return row if position is None else position[row]
+
+    type_ids = array("I", (intern(name) for name in log.type_names))
+    notes = array("I")
+    for pos, text in sorted((at(row), text) for row, text in log.notes.items()):
+        notes.append(pos)
+        notes.append(intern(text))
+    irregular = {str(at(row)): workout for row, workout in log.irregular.items()}
+    irregular_json = json.dumps(irregular, separators=(",", ":")).encode("utf-8") if irregular else b""
+
+    parts = [BINARY_BLOCK_HEADER.pack(count, len(type_ids), len(notes) // 2, len(irregular_json))]
+    parts.append(little_endian(type_ids))
+    parts.extend(little_endian(column) for column in columns)
+    parts.append(little_endian(notes))
+    parts.append(irregular_json)
+    return b"".join(parts)
+
+
+def unpack_workout_block(buffer, offset, strings):
+    count, type_count, note_count, irregular_size = BINARY_BLOCK_HEADER.unpack_from(buffer, offset)
+    offset += BINARY_BLOCK_HEADER.size
+
+    log = WorkoutLog.__new__(WorkoutLog)
+    type_ids, offset = read_column(buffer, offset, "I", type_count)
+    log.days, offset = read_column(buffer, offset, "i", count)
+    log.types, offset = read_column(buffer, offset, "I", count)
+    log.durations, offset = read_column(buffer, offset, "i", count)
+    log.calories, offset = read_column(buffer, offset, "i", count)
+    log.created, offset = read_column(buffer, offset, "q", count)
+    notes, offset = read_column(buffer, offset, "I", note_count * 2)
+
+    # Blocks are written in date order
+    log.order = array("i", range(count))
+    log.type_names = [strings[i] for i in type_ids]
+    log.type_ids = {name: i for i, name in enumerate(log.type_names)}
+    log.notes = {notes[i]: strings[notes[i + 1]] for i in range(0, len(notes), 2)}
+    log.irregular = {}
+    if irregular_size:
+        irregular = json.loads(bytes(buffer[offset:offset + irregular_size]))
+        log.irregular = {int(row): workout for row, workout in irregular.items()}
+        offset += irregular_size
+    return log, offset
+
+
+def benchmark_data_format(count=DATA_BENCH_WORKOUTS):
+    """Save/load time and file size for one account with count workouts, JSON vs. binary.
+
+    Loading counts the time to a ready WorkoutLog, which for JSON includes
+    building it from the parsed dicts the way login does. Returns
+    {format: (save_seconds, load_seconds, size_bytes)}.
+    """
+    import tempfile  # benchmark only; keep it off the startup path
+
+    data = {"bench": {
+        "password": "",
+        "email": "",
+        "profile": {},
+        "workouts": WorkoutLog(synthetic_workouts(count)),
+        "settings": {}
+    }}
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for data_format in DATA_FORMATS:
+            path = os.path.join(directory, f"users.{data_format}")
+            started = time.perf_counter()
+            save_data(data, path, data_format)
+            saved = time.perf_counter()
+            workouts = load_data(path)["bench"]["workouts"]
+            if not isinstance(workouts, WorkoutLog):
+                workouts = WorkoutLog(workouts)
+            loaded = time.perf_counter()
+            assert len(workouts) == count
+            results[data_format] = (saved - started, loaded - saved, os.path.getsize(path))
+    return results
+
+
+# ---------------------------
+# Workout Indexes
+# ---------------------------
+class WorkoutIndex:
+    """Date lookup over one user's workouts.
+
+    by_date maps an ISO date string to the workouts logged that day (in
+    created_at order) and dates keeps the distinct dates sorted, so a single
+    day costs one dict lookup and a date range costs two bisects plus the
+    days it actually covers.
+
+    Over a WorkoutLog a day is stored as an array of the log's rows rather
+    than a list of views, so indexing a workout costs four bytes instead of
+    a view object; read days through on() or between(), which hand them out
+    as LogRows.
+    """
+
+    def __init__(self, workouts=()):
+        self.by_date = {}
+        self.dates = []
+        self.type_counts = {}
+        self.count = 0
+        # The log of the first Workout view added; its rows are stored as arrays
+        self.log = None
+        self.add_many(workouts)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, workout):
+        day = workout.get("date", "")
+        if self.log is None and isinstance(workout, Workout):
+            self.log = workout.log
+        as_row = isinstance(workout, Workout) and workout.log is self.log
+        bucket = self.by_date.get(day)
+        if bucket is None:
+            bucket = self.by_date[day] = array("i") if as_row else []
+            bisect.insort(self.dates, day)
+        elif isinstance(bucket, array) and not as_row:
+            # Not one of the log's rows; keep this day as a plain list of workouts
+            bucket = self.by_date[day] = list(LogRows(self.log, bucket))
+        # Same-day workouts stay in created_at order
+        if isinstance(bucket, array):
+            bisect.insort(bucket, workout.row, key=self.log.created.__getitem__)
+        else:
+            bisect.insort(bucket, workout, key=self.created_key)
+        workout_type = workout.get("type", "")
+        self.type_counts[workout_type] = self.type_counts.get(workout_type, 0) + 1
+        self.count += 1
+
+    def add_many(self, workouts):
+        for workout in workouts:
+            self.add(workout)
+
+    @staticmethod
+    def created_key(workout):
+        if isinstance(workout, Workout):
+            # Straight from the log's column, without formatting the timestamp
+            return workout.log.created[workout.row]
+        return parse_created(workout.get("created_at"))
+
+    def on(self, day):
+        """Workouts logged on day (a date or an ISO string)"""
+        if isinstance(day, date):
+            day = day.isoformat()
+        bucket = self.by_date.get(day, [])
+        return LogRows(self.log, bucket) if isinstance(bucket, array) else bucket
+
+    def dates_between(self, start, end):
+        """Sorted dates with workouts in the inclusive range [start, end]"""
+        if isinstance(start, date):
+            start = start.isoformat()
+        if isinstance(end, date):
+            end = end.isoformat()
+        lo = bisect.bisect_left(self.dates, start)
+        hi = bisect.bisect_right(self.dates, end)
+        return self.dates[lo:hi]
+
+    def between(self, start, end):
+        """Yield (date, workouts) for each day with workouts in [start, end]"""
+        for day in self.dates_between(start, end):
+            yield day, self.on(day)
+
+
+class WorkoutRollups:
+    """Running calories/duration/session totals for one user.
+
+    Buckets are kept per day (ISO date), per ISO week (keyed by the Monday)
+    and per month ("YYYY-MM"). Each bucket is [calories, duration, sessions]
+    and is updated as workouts are added, so reading one is a dict lookup.
+    """
+
+    EMPTY = (0, 0, 0)
+
+    def __init__(self, workouts=()):
+        self.days = {}
+        self.weeks = {}
+        self.months = {}
+        self.add_many(workouts)
+
+    def add(self, workout):
+        calories = workout.get("calories") or 0
+        duration = workout.get("duration_min") or 0
+        day = workout.get("date", "")
+        self.bump(self.days, day, calories, duration)
+
+        try:
+            day_obj = date.fromisoformat(day)
+        except (TypeError, ValueError):
+            return
+        week_start = day_obj - timedelta(days=day_obj.weekday())
+        self.bump(self.weeks, week_start.isoformat(), calories, duration)
+        self.bump(self.months, day[:7], calories, duration)
+
+    def add_many(self, workouts):
+        for workout in workouts:
+            self.add(workout)
+
+    @staticmethod
+    def bump(buckets, key, calories, duration):
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = [0, 0, 0]
+        bucket[0] += calories
+        bucket[1] += duration
+        bucket[2] += 1
+
+    def day(self, day):
+        """(calories, duration, sessions) for a date or ISO string"""
+        if isinstance(day, date):
+            day = day.isoformat()
+        return tuple(self.days.get(day, self.EMPTY))
+
+    def week(self, day):
+        """(calories, duration, sessions) for the ISO week containing day"""
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        week_start = day - timedelta(days=day.weekday())
+        return tuple(self.weeks.get(week_start.isoformat(), self.EMPTY))
+
+    def month(self, year, month):
+        return tuple(self.months.get(f"{year:04d}-{month:02d}", self.EMPTY))
+
+
+# ---------------------------
+# Workout Signals
+# ---------------------------
+class Signal:
+    """A value that calls its subscribers when it changes"""
+
+    def __init__(self, value=None):
+        self.value = value
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+        return unsubscribe
+
+    def set(self, value):
+        if value == self.value:
+            return
+        self.value = value
+        for callback in list(self.subscribers):
+            callback(value)
+
+
+class WorkoutSignals:
+    """Observable views of the workout data that Tk widgets bind to.
+
+    A signal is keyed by (username, kind, key):
+      day           ISO date    -> (calories, duration, sessions)
+      week          Monday ISO  -> (calories, duration, sessions)
+      month         "YYYY-MM"   -> (calories, duration, sessions)
+      day_workouts  ISO date    -> list of that day's workouts
+      total         None        -> number of workouts
+    changed() notes which signals a batch of new workouts touches and
+    schedules one flush with after_idle, so a burst of saves or an import
+    batch recomputes each bound signal once. Signals nothing is bound to are
+    never computed.
+    """
+
+    def __init__(self, root, resolve):
+        self.root = root
+        self.resolve = resolve
+        self.signals = {}
+        self.dirty = set()
+        self.flush_pending = False
+
+    def signal(self, username, kind, key=None):
+        ident = (username, kind, key)
+        signal = self.signals.get(ident)
+        if signal is None:
+            signal = self.signals[ident] = Signal(self.resolve(username, kind, key))
+        return signal
+
+    def bind(self, widget, username, kind, key, callback, now=True):
+        """Call callback(value) when the signal changes, for as long as widget exists.
+
+        Returns a function that drops the binding.
+        """
+        ident = (username, kind, key)
+        signal = self.signal(username, kind, key)
+
+        def deliver(value):
+            if widget.winfo_exists():
+                callback(value)
+            else:
+                release()
+
+        unsubscribe = signal.subscribe(deliver)
+
+        def release():
+            unsubscribe()
+            if not signal.subscribers and self.signals.get(ident) is signal:
+                del self.signals[ident]
+
+        if now:
+            callback(signal.value)
+        return release
+
+    def changed(self, username, workouts):
+        """Record the signals that new workouts affect and schedule a flush"""
+        touched = [(username, "total", None)]
+        for workout in workouts:
+            day = workout.get("date", "")
+            touched.append((username, "day", day))
+            touched.append((username, "day_workouts", day))
+            try:
+                day_obj = date.fromisoformat(day)
+            except (TypeError, ValueError):
+                continue
+            week_start = day_obj - timedelta(days=day_obj.weekday())
+            touched.append((username, "week", week_start.isoformat()))
+            touched.append((username, "month", day[:7]))
+
+        self.dirty.update(ident for ident in touched if ident in self.signals)
+        if self.dirty and not self.flush_pending:
+            self.flush_pending = True
+            self.root.after_idle(self.flush)
+
+    def flush(self):
+        self.flush_pending = False
+        dirty, self.dirty = self.dirty, set()
+        for ident in dirty:
+            signal = self.signals.get(ident)
+            if signal is not None:
+                signal.set(self.resolve(*ident))
+
+
+# ---------------------------
+# CSV Import
+# ---------------------------
+IMPORT_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y")
+IMPORT_REQUIRED_COLUMNS = ("date", "type", "duration_min", "calories")
+
+
+def parse_import_date(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    value = (value or "").strip()
+    for fmt in IMPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date '{value}'")
+
+
+def parse_import_number(value, field):
+    if isinstance(value, int):
+        return value
+    number = value
+    if not isinstance(value, float):
+        value = (value or "").strip()
+        if not value:
+            return 0
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"{field} '{value}' is not a number")
+    # inf, nan and overflowing values like 1e400 parse as floats but have no integer value
+    if not math.isfinite(number):
+        raise ValueError(f"{field} '{value}' is not a finite number")
+    return int(number)
+
+
+def parse_workout_row(row):
+    """Validate and coerce one CSV row into a workout dict; raises ValueError"""
+    workout_type = (row.get("type") or "").strip()
+    if not workout_type:
+        raise ValueError("missing workout type")
+
+    duration = parse_import_number(row.get("duration_min"), "duration_min")
+    calories = parse_import_number(row.get("calories"), "calories")
+    if duration <= 0:
+        raise ValueError("duration must be greater than 0")
+    if calories < 0:
+        raise ValueError("calories cannot be negative")
+
+    return {
+        "date": parse_import_date(row.get("date")),
+        "type": workout_type,
+        "duration_min": duration,
+        "calories": calories,
+        "notes": row.get("notes") or "",
+        "created_at": row.get("created_at") or datetime.utcnow().isoformat()
+    }
+
+
+class CsvImportJob:
+    """Parses a CSV file on a worker thread in fixed-size batches.
+
+    Validated workouts are handed over through a small bounded queue, so the
+    reader never runs more than a few batches ahead of the UI and memory stays
+    flat however large the file is. Rows that fail validation are streamed to
+    a "<file>.rejects.csv" report instead of aborting the import.
+
+    Queue messages are ("batch", workouts, progress), ("done", None, 1.0) and
+    ("error", message, progress); progress is the fraction of bytes read.
+    """
+
+    def __init__(self, path, batch_size=IMPORT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.report_path = os.path.splitext(path)[0] + ".rejects.csv"
+        self.queue = queue.Queue(maxsize=4)
+        self.cancelled = threading.Event()
+        self.rows_read = 0
+        self.rejected = 0
+        self.report = None
+        self.thread = threading.Thread(target=self.run, name="csv-import", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def put(self, message):
+        # Block while the UI catches up, but give up promptly when cancelled
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            result = self.read_batches()
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            result = ("error", str(e), 0.0)
+        except Exception as e:
+            # Anything else would kill the thread silently and leave the dialog waiting
+            result = ("error", f"unexpected {type(e).__name__}: {e}", 0.0)
+        finally:
+            # Close the report before announcing the result so it is complete on disk
+            if self.report is not None:
+                self.report.close()
+        if result is not None:
+            self.put(result)
+
+    def read_batches(self):
+        """Feed batches to the queue; returns the final message, or None if cancelled"""
+        total_bytes = max(os.path.getsize(self.path), 1)
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or []
+            missing = [c for c in IMPORT_REQUIRED_COLUMNS if c not in fieldnames]
+            if missing:
+                return ("error", f"Missing columns: {', '.join(missing)}", 0.0)
+
+            batch = []
+            for row in reader:
+                if self.cancelled.is_set():
+                    return None
+                self.rows_read += 1
+                try:
+                    batch.append(parse_workout_row(row))
+                except ValueError as e:
+                    self.reject(reader.line_num, str(e), row, fieldnames)
+
+                if len(batch) >= self.batch_size:
+                    if not self.put(("batch", batch, f.buffer.tell() / total_bytes)):
+                        return None
+                    batch = []
+
+            if batch and not self.put(("batch", batch, 1.0)):
+                return None
+        return ("done", None, 1.0)
+
+    def reject(self, line_num, reason, row, fieldnames):
+        self.rejected += 1
+        if self.report is None:
+            self.report = open(self.report_path, "w", newline="", encoding="utf-8")
+            self.report_writer = csv.writer(self.report)
+            self.report_writer.writerow(["line", "reason"] + list(fieldnames))
+        self.report_writer.writerow([line_num, reason] + [row.get(c, "") for c in fieldnames])
+
+
+# ---------------------------
+# CSV Export
+# ---------------------------
+class CsvExportJob:
+    """Writes workouts to CSV (optionally gzipped) on a worker thread.
+
+    Rows come from an iterator, so nothing beyond the current row is held in
+    memory. Output goes to a temp file that only replaces the target once the
+    export completes; cancelling or failing leaves the target untouched.
+
+    Queue messages are ("progress", rows_written), ("done", rows_written)
+    and ("error", message).
+    """
+
+    PROGRESS_EVERY = 500
+
+    def __init__(self, path, rows, columns=WORKOUT_FIELDS, compress=False):
+        self.path = path
+        self.rows = rows
+        self.columns = list(columns)
+        self.compress = compress
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.written = 0
+        self.thread = threading.Thread(target=self.run, name="csv-export", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def open_output(self, path):
+        if self.compress:
+            return gzip.open(path, "wt", newline="", encoding="utf-8")
+        return open(path, "w", newline="", encoding="utf-8")
+
+    def failures(self):
+        """Exception types that end the export with a plain error message"""
+        return (OSError, ValueError, csv.Error, sqlite3.Error)
+
+    def run(self):
+        tmp_path = self.path + ".part"
+        try:
+            self.write(tmp_path)
+
+            if self.cancelled.is_set():
+                os.remove(tmp_path)
+                self.queue.put(("cancelled", self.written))
+            else:
+                os.replace(tmp_path, self.path)
+                self.queue.put(("done", self.written))
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            # The dialog waits for a terminal message, so every failure must post one
+            if isinstance(e, self.failures()):
+                self.queue.put(("error", str(e)))
+            else:
+                self.queue.put(("error", f"unexpected {type(e).__name__}: {e}"))
+
+    def write(self, tmp_path):
+        with self.open_output(tmp_path) as f:
+            # Imports may have added keys we don't export; skip them instead of failing
+            writer = csv.DictWriter(f, fieldnames=self.columns, extrasaction="ignore")
+            writer.writeheader()
+            for workout in self.rows:
+                if self.cancelled.is_set():
+                    break
+                writer.writerow(workout)
+                self.written += 1
+                if self.written % self.PROGRESS_EVERY == 0:
+                    self.queue.put(("progress", self.written))
+
+
+# ---------------------------
+# Columnar (Parquet / Arrow) Data
+# ---------------------------
+COLUMNAR_CHUNK_ROWS = 65536
+COLUMNAR_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow"
+}
+
+
+def import_pyarrow():
+    """pyarrow is optional; only the Parquet/Arrow features need it"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError:
+        raise ValueError("Parquet/Arrow support needs the 'pyarrow' package (pip install pyarrow)")
+    return pyarrow
+
+
+def arrow_errors():
+    """pyarrow's exception base as a tuple for except clauses; empty without pyarrow"""
+    try:
+        import pyarrow.lib
+    except ImportError:
+        return ()
+    return (pyarrow.lib.ArrowException,)
+
+
+def columnar_format(path):
+    for extension, fmt in COLUMNAR_EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return fmt
+    return None
+
+
+class WorkoutArrowEncoder:
+    """Turns workout dicts into typed Arrow record batches.
+
+    date becomes date32, durations and calories int32, and type is
+    dictionary-encoded against one dictionary that only grows, so every
+    batch's dictionary extends the previous one and can be written as a
+    delta in Arrow files.
+    """
+
+    def __init__(self, columns=WORKOUT_FIELDS):
+        self.pa = import_pyarrow()
+        self.columns = list(columns)
+        self.type_codes = {}
+        self.type_names = []
+
+        pa = self.pa
+        types = {
+            "date": pa.date32(),
+            "type": pa.dictionary(pa.int32(), pa.string()),
+            "duration_min": pa.int32(),
+            "calories": pa.int32(),
+            "notes": pa.string(),
+            "created_at": pa.string()
+        }
+        self.schema = pa.schema([(c, types[c]) for c in self.columns])
+
+    def encode(self, workouts):
+        pa = self.pa
+        arrays = []
+        for column in self.columns:
+            if column == "date":
+                arrays.append(pa.array([self.to_date(w.get("date")) for w in workouts], pa.date32()))
+            elif column == "type":
+                codes = [self.type_code(w.get("type") or "") for w in workouts]
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(codes, pa.int32()), pa.array(self.type_names, pa.string())
+                ))
+            elif column in ("duration_min", "calories"):
+                arrays.append(pa.array([w.get(column) for w in workouts], pa.int32()))
+            else:
+                arrays.append(pa.array([w.get(column) for w in workouts], pa.string()))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def type_code(self, name):
+        code = self.type_codes.get(name)
+        if code is None:
+            code = self.type_codes[name] = len(self.type_names)
+            self.type_names.append(name)
+        return code
+
+    @staticmethod
+    def to_date(value):
+        # Dates typed in by hand were never validated; store those as null
+        try:
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+
+def iter_chunks(rows, size=COLUMNAR_CHUNK_ROWS):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def workouts_frame(workouts, as_pandas=True):
+    """Workouts as a pandas DataFrame, or a dict of NumPy arrays when as_pandas is False"""
+    encoder = WorkoutArrowEncoder()
+    table = encoder.pa.Table.from_batches([encoder.encode(list(workouts))], schema=encoder.schema)
+    if as_pandas:
+        return table.to_pandas()
+    return {name: table.column(name).to_numpy() for name in table.column_names}
+
+
+class ColumnarExportJob(CsvExportJob):
+    """CsvExportJob that writes Parquet or Arrow IPC files in chunks"""
+
+    def __init__(self, path, rows, columns=WORKOUT_FIELDS, fmt="parquet"):
+        super().__init__(path, rows, columns)
+        self.fmt = fmt
+
+    def failures(self):
+        # ArrowTypeError and friends are not ValueErrors; report them the same way
+        return super().failures() + arrow_errors()
+
+    def write(self, tmp_path):
+        encoder = WorkoutArrowEncoder(self.columns)
+        pa = encoder.pa
+        if self.fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(tmp_path, encoder.schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(
+                tmp_path,
+                encoder.schema,
+                options=pa.ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+            )
+        try:
+            for chunk in iter_chunks(self.rows):
+                if self.cancelled.is_set():
+                    break
+                batch = encoder.encode(chunk)
+                if self.fmt == "parquet":
+                    writer.write_batch(batch)
+                else:
+                    writer.write(batch)
+                self.written += len(chunk)
+                self.queue.put(("progress", self.written))
+        finally:
+            writer.close()
+
+
+class ColumnarImportJob(CsvImportJob):
+    """CsvImportJob that reads Parquet or Arrow files batch by batch"""
+
+    def __init__(self, path, batch_size=IMPORT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self.fmt = columnar_format(path)
+
+    def run(self):
+        try:
+            result = self.read_batches()
+        except (OSError, ValueError) + arrow_errors() as e:
+            result = ("error", str(e), 0.0)
+        except Exception as e:
+            result = ("error", f"unexpected {type(e).__name__}: {e}", 0.0)
+        finally:
+            if self.report is not None:
+                self.report.close()
+        if result is not None:
+            self.put(result)
+
+    def record_batches(self):
+        pa = import_pyarrow()
+        if self.fmt == "parquet":
+            parquet_file = pa.parquet.ParquetFile(self.path)
+            total = parquet_file.metadata.num_rows
+            return total, parquet_file.iter_batches(batch_size=self.batch_size)
+
+        reader = pa.ipc.open_file(pa.memory_map(self.path))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches)), batches
+
+    def read_batches(self):
+        total, record_batches = self.record_batches()
+        total = max(total, 1)
+        fieldnames = None
+        for record_batch in record_batches:
+            if fieldnames is None:
+                fieldnames = record_batch.schema.names
+                missing = [c for c in IMPORT_REQUIRED_COLUMNS if c not in fieldnames]
+                if missing:
+                    return ("error", f"Missing columns: {', '.join(missing)}", 0.0)
+
+            batch = []
+            for row in record_batch.to_pylist():
+                if self.cancelled.is_set():
+                    return None
+                self.rows_read += 1
+                try:
+                    batch.append(parse_workout_row(row))
+                except ValueError as e:
+                    self.reject(self.rows_read, str(e), row, fieldnames)
+            if batch and not self.put(("batch", batch, min(self.rows_read / total, 1.0))):
+                return None
+        return ("done", None, 1.0)
+
+
+# ---------------------------
+# Analytics Engine
+# ---------------------------
+class WorkoutAnalytics:
+    """Column-oriented copy of one user's workouts for chart aggregation.
+
+    Workouts are kept as NumPy arrays: datetime64[D] dates (NaT for dates
+    that never parsed), int32 durations and calories, and int32 codes into
+    type_names. New workouts are buffered in plain lists and folded into the
+    arrays the next time a chart asks, so saving stays cheap and every
+    groupby below is a handful of vectorized calls.
+    """
+
+    FIELDS = ("duration_min", "calories")
+    NAT = -(2 ** 63)
+
+    def __init__(self, workouts=()):
+        load_numpy()
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.values = {field: np.empty(0, dtype=np.int32) for field in self.FIELDS}
+        self.type_codes = np.empty(0, dtype=np.int32)
+        self.type_names = []
+        self.type_lookup = {}
+        self.pending = []
+        # True while the arrays are in date order (workouts arrive sorted from a WorkoutLog)
+        self.ordered = True
+        self.add_many(workouts)
+
+    def __len__(self):
+        return len(self.dates) + len(self.pending)
+
+    def add(self, workout):
+        try:
+            day = (date.fromisoformat(workout.get("date", "")) - date(1970, 1, 1)).days
+        except (TypeError, ValueError):
+            day = self.NAT
+
+        workout_type = workout.get("type", "")
+        code = self.type_lookup.get(workout_type)
+        if code is None:
+            code = self.type_lookup[workout_type] = len(self.type_names)
+            self.type_names.append(workout_type)
+
+        self.pending.append((
+            day,
+            workout.get("duration_min") or 0,
+            workout.get("calories") or 0,
+            code
+        ))
+
+    def add_many(self, workouts):
+        for workout in workouts:
+            self.add(workout)
+
+    def flush(self):
+        """Fold buffered workouts into the arrays"""
+        if not self.pending:
+            return
+        days, durations, calories, codes = zip(*self.pending)
+        self.pending = []
+        days = np.array(days, dtype=np.int64)
+        if self.ordered:
+            # Compare as int64: NaT is the smallest value there, but unordered as a date
+            after_last = not len(self.dates) or days[0] >= self.dates[-1:].view(np.int64)[0]
+            self.ordered = bool(after_last and np.all(days[1:] >= days[:-1]))
+        self.dates = np.concatenate([self.dates, days.view("datetime64[D]")])
+        self.values["duration_min"] = np.concatenate([self.values["duration_min"], np.array(durations, dtype=np.int32)])
+        self.values["calories"] = np.concatenate([self.values["calories"], np.array(calories, dtype=np.int32)])
+        self.type_codes = np.concatenate([self.type_codes, np.array(codes, dtype=np.int32)])
+
+    def valid(self):
+        """Dates and the mask of workouts whose date parsed"""
+        self.flush()
+        return self.dates, ~np.isnat(self.dates)
+
+    def group_sum(self, keys, field, mask):
+        keys = keys[mask]
+        if keys.size == 0:
+            return keys, np.empty(0, dtype=np.int64)
+        buckets, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.values[field][mask], minlength=len(buckets))
+        return buckets, totals.astype(np.int64)
+
+    def daily(self, field):
+        """(days, totals) for every day that has workouts, in date order"""
+        dates, mask = self.valid()
+        return self.group_sum(dates, field, mask)
+
+    def weekly(self, field):
+        """(week starts, totals) grouped by ISO week (Monday start)"""
+        dates, mask = self.valid()
+        days = dates.astype(np.int64)
+        # 1970-01-01 was a Thursday, so (days + 3) % 7 is the weekday with Monday = 0
+        week_starts = (days - (days + 3) % 7).view("datetime64[D]")
+        return self.group_sum(week_starts, field, mask)
+
+    def monthly(self, field):
+        """(months, totals) grouped by calendar month"""
+        dates, mask = self.valid()
+        return self.group_sum(dates.astype("datetime64[M]"), field, mask)
+
+    def day_range(self, start, end, field):
+        """Totals for every day in [start, end], including days without workouts"""
+        dates, mask = self.valid()
+        start = np.datetime64(start, "D")
+        end = np.datetime64(end, "D")
+        span = int((end - start).astype(np.int64)) + 1
+        in_range = mask & (dates >= start) & (dates <= end)
+        offsets = (dates[in_range] - start).astype(np.int64)
+        totals = np.bincount(offsets, weights=self.values[field][in_range], minlength=span)
+        return np.arange(start, end + 1), totals.astype(np.int64)
+
+    def rolling_average(self, field, window=7):
+        """(days, mean of the trailing window of daily totals) over the whole history"""
+        days, totals = self.daily(field)
+        if days.size == 0:
+            return days, np.empty(0)
+        all_days, all_totals = self.day_range(days[0], days[-1], field)
+        kernel = np.ones(window) / window
+        return all_days, np.convolve(all_totals, kernel)[:len(all_totals)]
+
+    def by_type(self, field):
+        """(type names, totals, sessions) per workout type, largest total first"""
+        self.flush()
+        totals = np.bincount(self.type_codes, weights=self.values[field], minlength=len(self.type_names))
+        sessions = np.bincount(self.type_codes, minlength=len(self.type_names))
+        order = np.argsort(totals)[::-1]
+        return [self.type_names[i] for i in order], totals[order].astype(np.int64), sessions[order]
+
+    def series(self, field):
+        """(dates, values) for every dated workout in date order"""
+        self.sort()
+        dates, mask = self.valid()
+        return dates[mask], self.values[field][mask]
+
+    def sort(self):
+        """Put the arrays in date order once, instead of sorting on every series()"""
+        self.flush()
+        if self.ordered:
+            return
+        order = np.argsort(self.dates.view(np.int64), kind="stable")
+        self.dates = self.dates[order]
+        self.values = {field: values[order] for field, values in self.values.items()}
+        self.type_codes = self.type_codes[order]
+        self.ordered = True
+
+
+class WorkoutQueries:
+    """WorkoutAnalytics' aggregates, computed by SQLite instead of in Python.
+
+    daily, weekly, monthly, day_range and by_type return the same arrays as
+    their WorkoutAnalytics namesakes, but each is a single GROUP BY over the
+    covering workouts index, so only the grouped rows cross into Python.
+    """
+
+    FIELDS = WorkoutAnalytics.FIELDS
+    USER = "user_id = (SELECT id FROM users WHERE username = ?)"
+
+    def __init__(self, conn, username):
+        load_numpy()
+        self.conn = conn
+        self.username = username
+
+    def __len__(self):
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM workouts WHERE {self.USER}", (self.username,)
+        ).fetchone()[0]
+
+    def group_sum(self, key, field, where="", params=()):
+        """(keys, totals) for the workouts with a valid date, grouped by the SQL expression key"""
+        if field not in self.FIELDS:
+            raise ValueError(f"Unknown workout field: {field}")
+        rows = self.conn.execute(
+            f"SELECT {key} AS bucket, COALESCE(SUM({field}), 0) FROM workouts "
+            f"WHERE {self.USER} AND date(date) IS NOT NULL{where} "
+            "GROUP BY bucket ORDER BY bucket",
+            (self.username, *params)
+        ).fetchall()
+        return [row[0] for row in rows], np.array([row[1] for row in rows], dtype=np.int64)
+
+    def daily(self, field):
+        days, totals = self.group_sum("date", field)
+        return np.array(days, dtype="datetime64[D]"), totals
+
+    def weekly(self, field):
+        # 'weekday 0' moves to the week's Sunday; six days back is its Monday
+        weeks, totals = self.group_sum("date(date, 'weekday 0', '-6 days')", field)
+        return np.array(weeks, dtype="datetime64[D]"), totals
+
+    def monthly(self, field):
+        months, totals = self.group_sum("substr(date, 1, 7)", field)
+        return np.array(months, dtype="datetime64[M]"), totals
+
+    def day_range(self, start, end, field):
+        start = np.datetime64(start, "D")
+        end = np.datetime64(end, "D")
+        days, totals = self.group_sum("date", field, " AND date BETWEEN ? AND ?", (str(start), str(end)))
+        all_days = np.arange(start, end + 1)
+        all_totals = np.zeros(len(all_days), dtype=np.int64)
+        offsets = (np.array(days, dtype="datetime64[D]") - start).astype(np.int64)
+        all_totals[offsets] = totals
+        return all_days, all_totals
+
+    def by_type(self, field):
+        if field not in self.FIELDS:
+            raise ValueError(f"Unknown workout field: {field}")
+        rows = self.conn.execute(
+            f"SELECT type, COALESCE(SUM({field}), 0) AS total, COUNT(*) FROM workouts "
+            f"WHERE {self.USER} GROUP BY type ORDER BY total DESC",
+            (self.username,)
+        ).fetchall()
+        return (
+            [row[0] for row in rows],
+            np.array([row[1] for row in rows], dtype=np.int64),
+            np.array([row[2] for row in rows], dtype=np.int64)
+        )
+
+
+# ---------------------------
+# Chart Host
+# ---------------------------
+class ChartHost:
+    """Owns the single matplotlib Figure drawn inside a Tk frame.
+
+    Redrawing clears and reuses the same Figure and canvas instead of
+    stacking new ones, and everything is released when the frame is
+    destroyed. live_figures counts the figures currently held by hosts, which
+    makes leaks easy to spot (see chart_figure_count).
+
+    Artists passed to animate() are left out of normal draws and painted by
+    blit() on top of a cached background, so a live chart can move one bar or
+    point without re-rendering the axes, ticks and labels.
+    """
+
+    live_figures = 0
+
+    def __init__(self, frame, figsize=(8, 5), toolbar=False, bg=None):
+        load_plotting()
+        self.frame = frame
+        self.bg = bg
+        self.figure = Figure(figsize=figsize)
+        ChartHost.live_figures += 1
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=frame)
+        self.toolbar = None
+        if toolbar:
+            self.toolbar = NavigationToolbar2Tk(self.canvas, frame, pack_toolbar=False)
+            self.toolbar.update()
+        self.message = None
+        self.showing_chart = False
+
+        self.animated = []
+        self.background = None
+        self.updater = None
+        self.on_release = []
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+        frame.chart_host = self
+        frame.bind("<Destroy>", self.on_destroy, add="+")
+
+    @classmethod
+    def for_frame(cls, frame, **kwargs):
+        """The host already living in frame, or a new one"""
+        host = getattr(frame, "chart_host", None)
+        if host is None or host.figure is None:
+            host = cls(frame, **kwargs)
+        return host
+
+    def axes(self):
+        """Clear the figure and return a fresh Axes to draw on"""
+        self.show_chart()
+        self.figure.clear()
+        self.animated = []
+        self.background = None
+        return self.figure.add_subplot()
+
+    def draw(self):
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def animate(self, artists):
+        """Have blit() repaint these artists on their own"""
+        self.animated = list(artists)
+        for artist in self.animated:
+            artist.set_animated(True)
+
+    def on_draw(self, event):
+        # A full draw skips animated artists: keep what it drew as the
+        # background, then paint them on top
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_animated()
+
+    def draw_animated(self):
+        for artist in self.animated:
+            self.figure.draw_artist(artist)
+
+    def blit(self):
+        """Repaint only the animated artists, falling back to a full draw"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def rescale(self, ax):
+        """Refit the axes limits to the data and do a full draw"""
+        ax.relim()
+        ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def show_chart(self):
+        if self.showing_chart:
+            return
+        if self.message is not None:
+            self.message.pack_forget()
+        if self.toolbar is not None:
+            self.toolbar.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.showing_chart = True
+
+    def show_message(self, text, font=("Segoe UI", 12), bg=None, fg=None, pady=0):
+        """Swap the chart for a text message (e.g. when there is no data)"""
+        self.canvas.get_tk_widget().pack_forget()
+        if self.toolbar is not None:
+            self.toolbar.pack_forget()
+        self.showing_chart = False
+
+        if self.message is None:
+            self.message = tk.Label(self.frame)
+        self.message.config(text=text, font=font, bg=bg or self.bg, fg=fg)
+        self.message.pack(expand=True, fill="both", pady=pady)
+
+    def on_destroy(self, event):
+        if event.widget is self.frame:
+            self.release()
+
+    def release(self):
+        if self.figure is None:
+            return
+        for callback in self.on_release:
+            callback()
+        self.on_release = []
+        self.updater = None
+        self.animated = []
+        self.background = None
+        self.figure.clear()
+        self.figure = None
+        self.canvas = None
+        self.toolbar = None
+        self.frame.chart_host = None
+        ChartHost.live_figures -= 1
+
+
+def chart_figure_count():
+    """Figures currently alive: those held by chart hosts plus any stray pyplot figures"""
+    count = ChartHost.live_figures
+    if "matplotlib.pyplot" in sys.modules:
+        count += len(sys.modules["matplotlib.pyplot"].get_fignums())
+    return count
+
+
+# ---------------------------
+# Content Views
+# ---------------------------
+class ContentView:
+    """One page of the main content area and the hooks that keep it current"""
+
+    def __init__(self, build, refresh=None, on_show=None, on_hide=None):
+        self.build = build
+        self.refresh = refresh
+        self.on_show = on_show
+        self.on_hide = on_hide
+        self.frame = None
+        self.stale = False
+
+
+class ViewManager:
+    """Builds each content page once and swaps them in and out of a parent frame.
+
+    Switching pages only packs and unpacks frames. When data changes, pages
+    are marked stale with invalidate(); a stale page runs its refresh hook,
+    which updates its data-bound widgets, the next time it is shown. The page
+    on screen is refreshed once the event loop goes idle, so a burst of
+    changes (e.g. an import) costs one refresh.
+    """
+
+    def __init__(self, parent, bg=None):
+        self.parent = parent
+        self.bg = bg
+        self.views = {}
+        self.current = None
+        self.refresh_pending = False
+
+    def register(self, name, build, refresh=None, on_show=None, on_hide=None):
+        self.views[name] = ContentView(build, refresh, on_show, on_hide)
+
+    def show(self, name):
+        view = self.views[name]
+        if view.frame is None:
+            view.frame = tk.Frame(self.parent, bg=self.bg)
+            view.build(view.frame)
+            view.stale = False
+        elif view.stale:
+            self.refresh(view)
+
+        if self.current != name:
+            previous = self.views.get(self.current)
+            if previous is not None and previous.frame is not None:
+                previous.frame.pack_forget()
+                if previous.on_hide:
+                    previous.on_hide()
+            view.frame.pack(fill="both", expand=True)
+            self.current = name
+            if view.on_show:
+                view.on_show()
+        view.frame.tkraise()
+
+    def refresh(self, view):
+        view.stale = False
+        if view.refresh:
+            view.refresh()
+
+    def invalidate(self, *names):
+        """Mark pages (all of them by default) as needing a refresh"""
+        for name in names or list(self.views):
+            view = self.views[name]
+            if view.frame is not None:
+                view.stale = True
+
+        if self.current in (names or self.views) and not self.refresh_pending:
+            self.refresh_pending = True
+            self.parent.after_idle(self.refresh_current)
+
+    def refresh_current(self):
+        self.refresh_pending = False
+        if not self.parent.winfo_exists():
+            return
+        view = self.views.get(self.current)
+        if view is not None and view.stale and view.frame is not None:
+            self.refresh(view)
+
+    def reset(self):
+        """Throw every built page away; each is rebuilt when next shown"""
+        current = self.views.get(self.current)
+        if current is not None and current.on_hide:
+            current.on_hide()
+        for view in self.views.values():
+            if view.frame is not None:
+                view.frame.destroy()
+                view.frame = None
+        self.current = None
+
+
+# ---------------------------
+# Calendar Canvas
+# ---------------------------
+class CalendarCanvas:
+    """Month grid drawn on a single tk.Canvas.
+
+    The 42 day cells (6 weeks x 7 days) are created once as canvas items
+    tagged per cell; render() only re-configures their text and colours, so
+    changing month creates and destroys nothing. Clicks and hover are
+    resolved from the pointer position by one handler each.
+
+    render() takes a describe(date) callback returning the cell's style:
+    fill, outline, fg, bold, icons [(text, colour)], badge text and marker.
+    """
+
+    ROWS = 6
+    COLS = 7
+    DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+    MAX_ICONS = 3
+
+    def __init__(self, parent, on_click, bg, width, height, hover_fill=None,
+                 number_font=("Segoe UI", 10), number_anchor="nw",
+                 header_font=None, header_fg=None, gap=2):
+        self.canvas = tk.Canvas(parent, bg=bg, width=width, height=height, highlightthickness=0)
+        self.on_click = on_click
+        self.bg = bg
+        self.hover_fill = hover_fill
+        self.number_font = number_font
+        self.number_anchor = number_anchor
+        self.header_height = 28 if header_font else 0
+        self.gap = gap
+        self.cell_w = width / self.COLS
+        self.cell_h = (height - self.header_height) / self.ROWS
+
+        self.days = [None] * (self.ROWS * self.COLS)
+        self.styles = [None] * len(self.days)
+        self.hover = None
+
+        self.header_items = []
+        if header_font:
+            for name in self.DAY_NAMES:
+                self.header_items.append(
+                    self.canvas.create_text(0, 0, text=name, font=header_font, fill=header_fg)
+                )
+        self.cells = [self.create_cell(i) for i in range(len(self.days))]
+
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Leave>", lambda e: self.set_hover(None))
+        self.canvas.bind("<Button-1>", self.on_press)
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def create_cell(self, i):
+        tags = ("cell", f"cell{i}")
+        create = self.canvas
+        return {
+            "rect": create.create_rectangle(0, 0, 0, 0, width=1, tags=tags),
+            "number": create.create_text(0, 0, anchor=self.number_anchor, tags=tags),
+            "icons": [
+                create.create_text(0, 0, font=("Segoe UI", 14), state="hidden", tags=tags)
+                for _ in range(self.MAX_ICONS)
+            ],
+            "badge_bg": create.create_rectangle(0, 0, 0, 0, width=0, state="hidden", tags=tags),
+            "badge": create.create_text(
+                0, 0, font=("Segoe UI", 8, "bold"), fill="white", state="hidden", tags=tags
+            ),
+            "marker": create.create_line(0, 0, 0, 0, width=3, state="hidden", tags=tags)
+        }
+
+    def render(self, year, month, describe):
+        """Show a month, styling each day with describe(date)"""
+        import calendar
+        weeks = calendar.monthcalendar(year, month)
+        self.set_hover(None)
+        for i in range(len(self.days)):
+            row, col = divmod(i, self.COLS)
+            day = weeks[row][col] if row < len(weeks) else 0
+            if day:
+                day_obj = date(year, month, day)
+                self.paint(i, day_obj, describe(day_obj))
+            else:
+                self.paint(i, None, None)
+
+    def paint(self, i, day, style):
+        cell = self.cells[i]
+        canvas = self.canvas
+        self.days[i] = day
+        self.styles[i] = style
+
+        if day is None:
+            canvas.itemconfigure(cell["rect"], fill=self.bg, outline=self.bg)
+            canvas.itemconfigure(cell["number"], state="hidden")
+            for item in cell["icons"]:
+                canvas.itemconfigure(item, state="hidden")
+            for key in ("badge_bg", "badge", "marker"):
+                canvas.itemconfigure(cell[key], state="hidden")
+            return
+
+        canvas.itemconfigure(cell["rect"], fill=style["fill"], outline=style.get("outline", style["fill"]))
+        weight = "bold" if style.get("bold") else "normal"
+        canvas.itemconfigure(
+            cell["number"],
+            text=str(day.day),
+            font=self.number_font + (weight,),
+            fill=style["fg"],
+            state="normal"
+        )
+
+        icons = style.get("icons", ())[:self.MAX_ICONS]
+        for item, icon in zip(cell["icons"], icons):
+            canvas.itemconfigure(item, text=icon[0], fill=icon[1], state="normal")
+        for item in cell["icons"][len(icons):]:
+            canvas.itemconfigure(item, state="hidden")
+
+        badge = style.get("badge")
+        state = "normal" if badge else "hidden"
+        canvas.itemconfigure(cell["badge"], text=badge or "", state=state)
+        canvas.itemconfigure(cell["badge_bg"], fill=style.get("badge_fill", ""), state=state)
+
+        marker = style.get("marker")
+        canvas.itemconfigure(cell["marker"], fill=marker or "", state="normal" if marker else "hidden")
+
+        self.place(i)
+
+    def place(self, i):
+        """Position cell i's items for the current cell size"""
+        cell = self.cells[i]
+        canvas = self.canvas
+        row, col = divmod(i, self.COLS)
+        half_gap = self.gap / 2
+        x0 = col * self.cell_w + half_gap
+        y0 = self.header_height + row * self.cell_h + half_gap
+        x1 = x0 + self.cell_w - self.gap
+        y1 = y0 + self.cell_h - self.gap
+        w, h = x1 - x0, y1 - y0
+
+        canvas.coords(cell["rect"], x0, y0, x1, y1)
+        if self.number_anchor == "center":
+            canvas.coords(cell["number"], x0 + w / 2, y0 + h / 2)
+        else:
+            canvas.coords(cell["number"], x0 + 5, y0 + 5)
+
+        style = self.styles[i] or {}
+        shown = min(len(style.get("icons", ())), self.MAX_ICONS)
+        for k, item in enumerate(cell["icons"][:shown]):
+            canvas.coords(item, x0 + w / 2 + (k - (shown - 1) / 2) * 20, y0 + h / 2)
+
+        if style.get("badge"):
+            canvas.coords(cell["badge"], x0 + w * 0.85, y0 + h * 0.15)
+            bx0, by0, bx1, by1 = canvas.bbox(cell["badge"])
+            canvas.coords(cell["badge_bg"], bx0 - 4, by0 - 1, bx1 + 4, by1 + 1)
+        canvas.coords(cell["marker"], x0 + w * 0.1, y0 + h * 0.95, x0 + w * 0.9, y0 + h * 0.95)
+
+    def on_resize(self, event):
+        self.cell_w = event.width / self.COLS
+        self.cell_h = (event.height - self.header_height) / self.ROWS
+        for col, item in enumerate(self.header_items):
+            self.canvas.coords(item, (col + 0.5) * self.cell_w, self.header_height / 2)
+        for i in range(len(self.cells)):
+            self.place(i)
+
+    def cell_at(self, x, y):
+        """Index of the in-month cell under (x, y), or None"""
+        if y < self.header_height:
+            return None
+        col = int(x // self.cell_w)
+        row = int((y - self.header_height) // self.cell_h)
+        if not (0 <= col < self.COLS and 0 <= row < self.ROWS):
+            return None
+        i = row * self.COLS + col
+        return i if self.days[i] is not None else None
+
+    def on_motion(self, event):
+        self.set_hover(self.cell_at(event.x, event.y))
+
+    def set_hover(self, i):
+        if i == self.hover:
+            return
+        if self.hover is not None and self.styles[self.hover]:
+            self.canvas.itemconfigure(self.cells[self.hover]["rect"], fill=self.styles[self.hover]["fill"])
+        self.hover = i
+        if i is not None and self.hover_fill:
+            self.canvas.itemconfigure(self.cells[i]["rect"], fill=self.hover_fill)
+        self.canvas.config(cursor="hand2" if i is not None else "")
+
+    def on_press(self, event):
+        i = self.cell_at(event.x, event.y)
+        if i is not None:
+            self.on_click(self.days[i])
+
+
+class YearHeatmap:
+    """GitHub-style year of daily activity drawn on a single canvas.
+
+    One square per day, a column per week (Monday on top). The squares are
+    created once; render() colours them from a daily rollup dict in one pass
+    over the year and only re-configures squares whose colour changed, so
+    moving between years or picking up a new workout is cheap.
+    """
+
+    CELL = 12
+    STEP = 14
+    LEFT = 32
+    TOP = 20
+    WEEKS = 54
+    LEVELS = 4
+
+    def __init__(self, parent, bg, fg, empty, palette, on_click=None, on_scroll=None):
+        self.width = self.LEFT + self.WEEKS * self.STEP + 8
+        self.height = self.TOP + 7 * self.STEP + 26
+        self.canvas = tk.Canvas(parent, bg=bg, width=self.width, height=self.height, highlightthickness=0)
+        self.fg = fg
+        self.empty = empty
+        self.palette = palette
+        self.on_click = on_click
+        self.on_scroll = on_scroll
+        self.year = None
+        self.start = None
+        self.unit = ""
+        self.values = [0] * (self.WEEKS * 7)
+        self.colors = [None] * len(self.values)
+
+        canvas = self.canvas
+        self.cells = []
+        for i in range(len(self.values)):
+            col, row = divmod(i, 7)
+            x0 = self.LEFT + col * self.STEP
+            y0 = self.TOP + row * self.STEP
+            self.cells.append(
+                canvas.create_rectangle(x0, y0, x0 + self.CELL, y0 + self.CELL, width=0, state="hidden")
+            )
+
+        for row, name in ((0, "Mon"), (2, "Wed"), (4, "Fri")):
+            canvas.create_text(
+                self.LEFT - 6, self.TOP + row * self.STEP + self.CELL / 2,
+                text=name, anchor="e", font=("Segoe UI", 8), fill=fg
+            )
+        self.month_labels = [
+            canvas.create_text(0, self.TOP - 8, anchor="w", font=("Segoe UI", 8), fill=fg)
+            for _ in range(12)
+        ]
+
+        # Hover read-out on the left, legend on the right
+        bottom = self.height - 12
+        self.status = canvas.create_text(self.LEFT, bottom, anchor="w", font=("Segoe UI", 9), fill=fg)
+        x = self.width - 8 - (self.LEVELS + 1) * self.STEP - 30
+        canvas.create_text(x - 4, bottom, text="Less", anchor="e", font=("Segoe UI", 8), fill=fg)
+        for color in [empty] + list(palette):
+            canvas.create_rectangle(x, bottom - self.CELL / 2, x + self.CELL, bottom + self.CELL / 2,
+                                    fill=color, width=0)
+            x += self.STEP
+        canvas.create_text(x + 2, bottom, text="More", anchor="w", font=("Segoe UI", 8), fill=fg)
+
+        canvas.bind("<Motion>", self.on_motion)
+        canvas.bind("<Leave>", lambda e: canvas.itemconfigure(self.status, text=""))
+        canvas.bind("<Button-1>", self.on_press)
+        canvas.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        canvas.bind("<Button-4>", lambda e: self.scroll(-1))
+        canvas.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def render(self, year, days, field, unit=""):
+        """Colour the squares for year from days (ISO date -> rollup bucket), using bucket[field]"""
+        first = date(year, 1, 1)
+        self.year = year
+        self.start = first - timedelta(days=first.weekday())
+        self.unit = unit
+
+        # One pass over the year's days, looking each up in the rollup
+        values = self.values
+        for i in range(len(values)):
+            values[i] = None
+        day = first
+        offset = first.weekday()
+        while day.year == year:
+            bucket = days.get(day.isoformat())
+            values[offset] = bucket[field] if bucket else 0
+            day += timedelta(days=1)
+            offset += 1
+
+        peak = max((v for v in values if v), default=0)
+        canvas = self.canvas
+        for i, value in enumerate(values):
+            if value is None:
+                color = None
+            elif value <= 0:
+                color = self.empty
+            else:
+                level = min(self.LEVELS, int(-(-value * self.LEVELS // peak)))
+                color = self.palette[level - 1]
+            if color != self.colors[i]:
+                if color is None:
+                    canvas.itemconfigure(self.cells[i], state="hidden")
+                else:
+                    canvas.itemconfigure(self.cells[i], fill=color, state="normal")
+                self.colors[i] = color
+
+        for month, label in enumerate(self.month_labels, start=1):
+            first_of_month = date(year, month, 1)
+            col = (first_of_month - self.start).days // 7
+            canvas.coords(label, self.LEFT + col * self.STEP, self.TOP - 8)
+            canvas.itemconfigure(label, text=first_of_month.strftime("%b"))
+
+    def day_at(self, x, y):
+        """(date, value) of the square under (x, y), or None"""
+        if self.start is None or x < self.LEFT or y < self.TOP:
+            return None
+        col = int((x - self.LEFT) // self.STEP)
+        row = int((y - self.TOP) // self.STEP)
+        if not (0 <= col < self.WEEKS and 0 <= row < 7):
+            return None
+        i = col * 7 + row
+        if self.values[i] is None:
+            return None
+        return self.start + timedelta(days=i), self.values[i]
+
+    def on_motion(self, event):
+        hit = self.day_at(event.x, event.y)
+        text = ""
+        if hit is not None:
+            day, value = hit
+            text = f"{day.strftime('%a, %b %d %Y')}: {value:,} {self.unit}".rstrip()
+        self.canvas.itemconfigure(self.status, text=text)
+        self.canvas.config(cursor="hand2" if hit is not None else "")
+
+    def on_press(self, event):
+        hit = self.day_at(event.x, event.y)
+        if hit is not None and self.on_click:
+            self.on_click(hit[0])
+
+    def scroll(self, delta):
+        if self.on_scroll:
+            self.on_scroll(delta)
+
+
+# ---------------------------
+# History Grid
+# ---------------------------
+class DateOrderedRows:
+    """Read-only row sequence that pages straight out of a WorkoutIndex.
+
+    Only a running row count per day is kept, so opening the date-sorted
+    history costs one step per distinct day instead of copying and sorting
+    every workout; a page is then two bisects plus the buckets it touches.
+    """
+
+    def __init__(self, index, start=None, end=None, descending=True):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.descending = descending
+        self.count = None
+        self.days = []
+        self.ends = []
+
+    def sync(self):
+        # Workouts added since the last page shift every later position; recount
+        if self.count == self.index.count:
+            return
+        if self.start or self.end:
+            days = self.index.dates_between(self.start or "", self.end or "\uffff")
+        else:
+            days = list(self.index.dates)
+        if self.descending:
+            days.reverse()
+        self.days = days
+        self.ends = list(accumulate(len(self.index.by_date[day]) for day in days))
+        self.count = self.index.count
+
+    def __len__(self):
+        self.sync()
+        return self.ends[-1] if self.ends else 0
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            rows = self[key:key + 1] if key >= 0 else self[len(self) + key:len(self) + key + 1]
+            if not rows:
+                raise IndexError("row index out of range")
+            return rows[0]
+
+        start, stop, _ = key.indices(len(self))
+        rows = []
+        position = bisect.bisect_right(self.ends, start)
+        while start < stop and position < len(self.days):
+            bucket = self.index.on(self.days[position])
+            if self.descending:
+                bucket = bucket[::-1]
+            first = start - (self.ends[position - 1] if position else 0)
+            taken = bucket[first:first + stop - start]
+            rows.extend(taken)
+            start += len(taken)
+            position += 1
+        return rows
+
+
+class VirtualHistoryGrid:
+    """Workout table that only ever holds one screenful of Treeview rows.
+
+    Filtering and sorting work on a list of references into the user's
+    WorkoutIndex; scrolling just moves an offset into that list and rewrites
+    the values of the visible rows, so the Tk side costs the same whether the
+    history has fifty workouts or fifty thousand. Over a WorkoutLog the list
+    is an array of log rows sorted by keys read from the log's columns, and
+    the plain date order is paged straight from the index.
+    """
+
+    COLUMNS = ("date", "type", "duration", "calories", "notes")
+    SORT_KEYS = {
+        "date": lambda w: (w.get("date", ""), w.get("created_at") or ""),
+        "type": lambda w: (w.get("type") or "").lower(),
+        "duration": lambda w: w.get("duration_min") or 0,
+        "calories": lambda w: w.get("calories") or 0,
+        "notes": lambda w: (w.get("notes") or "").lower()
+    }
+
+    def __init__(self, parent, index, on_change=None, page_size=20):
+        self.index = index
+        self.on_change = on_change
+        self.page_size = page_size
+        self.rows = []
+        self.offset = 0
+        self.sort_column = "date"
+        self.sort_desc = True
+        self.filters = {}
+
+        self.scroll_y = ttk.Scrollbar(parent, orient="vertical", command=self.on_scrollbar)
+        self.scroll_x = ttk.Scrollbar(parent, orient="horizontal")
+        self.tree = ttk.Treeview(
+            parent,
+            columns=self.COLUMNS,
+            show="headings",
+            height=page_size,
+            selectmode="browse",
+            xscrollcommand=self.scroll_x.set
+        )
+        self.scroll_x.config(command=self.tree.xview)
+
+        headings = {
+            "date": "Date",
+            "type": "Workout Type",
+            "duration": "Duration",
+            "calories": "Calories",
+            "notes": "Notes"
+        }
+        for column, text in headings.items():
+            self.tree.heading(column, text=text, command=lambda c=column: self.sort_by(c))
+
+        self.tree.column("date", width=120, anchor="center")
+        self.tree.column("type", width=150, anchor="center")
+        self.tree.column("duration", width=100, anchor="center")
+        self.tree.column("calories", width=100, anchor="center")
+        self.tree.column("notes", width=300, anchor="w")
+
+        self.scroll_y.pack(side="right", fill="y")
+        self.scroll_x.pack(side="bottom", fill="x")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.tree.bind("<Configure>", self.on_resize)
+
+        self.refresh()
+
+    def set_filters(self, start=None, end=None, workout_type=None, min_calories=None, max_calories=None):
+        self.filters = {
+            "start": start,
+            "end": end,
+            "type": workout_type,
+            "min_calories": min_calories,
+            "max_calories": max_calories
+        }
+        self.refresh()
+
+    def sort_by(self, column):
+        if self.sort_column == column:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_column = column
+            self.sort_desc = column != "type" and column != "notes"
+        self.refresh()
+
+    def refresh(self, keep_offset=False):
+        """Re-run the query and jump back to the first row (or stay put)"""
+        self.rows = self.query()
+        self.offset = min(self.offset, self.max_offset()) if keep_offset else 0
+        self.render()
+
+    def query(self):
+        start = self.filters.get("start")
+        end = self.filters.get("end")
+        keep = self.row_filter()
+        if self.sort_column == "date" and keep is None:
+            # The index is already in date order: page from it without building a list
+            return DateOrderedRows(self.index, start, end, self.sort_desc)
+
+        if start or end:
+            days = self.index.dates_between(start or "", end or "\uffff")
+        else:
+            days = self.index.dates
+
+        if self.sort_column == "date" and self.sort_desc:
+            days = reversed(days)
+
+        log = self.index.log
+        days = list(days)
+        if log is not None and all(isinstance(self.index.by_date[day], array) for day in days):
+            return self.query_rows(log, days, keep)
+
+        rows = []
+        for day in days:
+            bucket = self.index.on(day)
+            if self.sort_column == "date" and self.sort_desc:
+                bucket = reversed(bucket)
+            if keep is None:
+                rows.extend(bucket)
+            else:
+                rows.extend(w for w in bucket if keep(w))
+
+        if self.sort_column != "date":
+            rows.sort(key=self.SORT_KEYS[self.sort_column], reverse=self.sort_desc)
+        return rows
+
+    def query_rows(self, log, days, keep):
+        """query() over the log's row numbers: no view is kept and no key is formatted"""
+        descending = self.sort_column == "date" and self.sort_desc
+        rows = array("i")
+        for day in days:
+            bucket = self.index.by_date[day]
+            rows.extend(bucket[::-1] if descending else bucket)
+        if keep is not None:
+            rows = array("i", (row for row in rows if keep(Workout(log, row))))
+        if self.sort_column != "date":
+            rows = array("i", sorted(rows, key=self.column_key(log), reverse=self.sort_desc))
+        return LogRows(log, rows)
+
+    def column_key(self, log):
+        """SORT_KEYS[sort_column] as a function of a log row, read from the log's columns"""
+        column = self.sort_column
+        if column == "type":
+            names = [name.lower() for name in log.type_names]
+            types = log.types
+            key = lambda row: names[types[row]]
+        elif column == "duration":
+            key = log.durations.__getitem__
+        elif column == "calories":
+            key = log.calories.__getitem__
+        else:
+            notes = log.notes
+            key = lambda row: notes.get(row, "").lower()
+        if not log.irregular:
+            return key
+
+        # Workouts that did not fit the columns keep their dict; sort those as dicts
+        irregular = log.irregular
+        dict_key = self.SORT_KEYS[column]
+        return lambda row: dict_key(irregular[row]) if row in irregular else key(row)
+
+    def row_filter(self):
+        workout_type = self.filters.get("type")
+        min_calories = self.filters.get("min_calories")
+        max_calories = self.filters.get("max_calories")
+        if not workout_type and min_calories is None and max_calories is None:
+            return None
+
+        def keep(workout):
+            if workout_type and workout.get("type") != workout_type:
+                return False
+            calories = workout.get("calories") or 0
+            if min_calories is not None and calories < min_calories:
+                return False
+            if max_calories is not None and calories > max_calories:
+                return False
+            return True
+        return keep
+
+    def render(self):
+        """Rewrite the visible rows for the current offset"""
+        visible = self.rows[self.offset:self.offset + self.page_size]
+        items = self.tree.get_children()
+
+        for i, workout in enumerate(visible):
+            values = (
+                workout.get("date", ""),
+                workout.get("type", ""),
+                f"{workout.get('duration_min', 0)} min",
+                f"{workout.get('calories', 0)} cal",
+                workout.get("notes", "")
+            )
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert("", "end", values=values)
+
+        if len(items) > len(visible):
+            self.tree.delete(*items[len(visible):])
+
+        total = len(self.rows)
+        if total:
+            self.scroll_y.set(self.offset / total, min(1.0, (self.offset + len(visible)) / total))
+        else:
+            self.scroll_y.set(0.0, 1.0)
+
+        if self.on_change:
+            self.on_change(self.offset, len(visible), total)
+
+    def max_offset(self):
+        return max(0, len(self.rows) - self.page_size)
+
+    def scroll_to(self, offset):
+        offset = min(max(0, int(offset)), self.max_offset())
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.rows))
+        elif action == "scroll":
+            step = self.page_size if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or 20
+        # Leave room for the heading row
+        page_size = max(1, (event.height // int(row_height)) - 1)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.tree.config(height=page_size)
+            self.offset = min(self.offset, self.max_offset())
+            self.render()
 
-def save_data(data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
 
 class FitnessTrackerApp:
     def __init__(self, root):
@@ -72,8 +3588,25 @@ class FitnessTrackerApp:
         self.root.bind('<F11>', lambda e: self.toggle_fullscreen())
         self.root.bind('<Escape>', lambda e: self.exit_fullscreen())
         self.is_fullscreen = False
-        self.data = load_data()
         self.settings = load_settings()
+        self.storage = get_storage(self.settings)
+        # Only the directory is read up front; a user's workouts load at login
+        self.users = self.storage.load_directory()
+        self.data = {}
+        self.tasks = TaskExecutor(self.root, on_busy=self.show_saving)
+        self.saves = SaveScheduler(
+            self.root,
+            self.tasks,
+            self.storage,
+            lambda: self.data,
+            self.settings.get("autosave_window_ms", AUTOSAVE_WINDOW_MS)
+        )
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.analytics_task = None
+        self.reset_workout_caches()
+        self.workout_listeners = []
+        self.workout_signals = WorkoutSignals(self.root, self.resolve_workout_signal)
+        self.subscribe_workouts(self.workout_signals.changed)
         self.current_user = None
         self.is_logged_in = False
         self.dark_mode = self.settings.get("dark_mode", True)
@@ -772,7 +4305,7 @@ class FitnessTrackerApp:
             messagebox.showerror("Error", "Please enter username")
             return
         
-        user_data = self.data.get(username)
+        user_data = self.users.get(username)
         if not user_data:
             messagebox.showerror("Error", "Username not found")
             return
@@ -842,7 +4375,7 @@ class FitnessTrackerApp:
             messagebox.showerror("Error", "Please enter both username and email")
             return
         
-        user_data = self.data.get(username)
+        user_data = self.users.get(username)
         if not user_data:
             messagebox.showerror("Error", "Username not found")
             return
@@ -883,11 +4416,26 @@ class FitnessTrackerApp:
             messagebox.showerror("Error", "Please enter username and password")
             return
 
-        user = self.data.get(username)
+        user = self.users.get(username)
         if not user or user.get("password") != password:
             messagebox.showerror("Login Failed", "Invalid credentials")
             return
 
+        # A freshly registered account may still be waiting in the save scheduler
+        if username not in self.data:
+            loaded = self.storage.load_user(username)
+            if loaded is None:
+                # Listed but unreadable: an empty stand-in would be saved over the real data
+                messagebox.showerror(
+                    "Login Failed",
+                    f"The data for '{username}' could not be read, so the account was not opened.\n"
+                    "Your saved data has been left as it is."
+                )
+                return
+            self.data[username] = loaded
+        workouts = self.data[username].get("workouts", [])
+        if not isinstance(workouts, WorkoutLog):
+            self.data[username]["workouts"] = WorkoutLog(workouts)
         self.current_user = username
         self.is_logged_in = True
     
@@ -899,6 +4447,10 @@ class FitnessTrackerApp:
         self.show_dashboard()
         self.toggle_sidebar()
 
+        # Load the chart stack in the background while the dashboard is in use
+        threading.Thread(target=prewarm_plotting, name="prewarm-plotting", daemon=True).start()
+        self.prefetch_workout_analytics()
+
     def register(self):
         username = self.reg_username.get().strip()
         email = self.reg_email.get().strip()
@@ -909,7 +4461,7 @@ class FitnessTrackerApp:
             messagebox.showerror("Error", "All fields are required")
             return
 
-        if username in self.data:
+        if username in self.users:
             messagebox.showerror("Error", "Username already exists")
             return
 
@@ -932,11 +4484,12 @@ class FitnessTrackerApp:
             "password": password,
             "email": email,
             "profile": {},
-            "workouts": [],
+            "workouts": WorkoutLog(),
             "settings": {}
         }
 
-        save_data(self.data)
+        self.users[username] = directory_entry(self.data[username])
+        self.saves.mark_user(username)
         messagebox.showinfo("Success", "Account created successfully!")
         self.show_login_screen()
 
@@ -1006,11 +4559,34 @@ class FitnessTrackerApp:
             pady=8,
             compound="left"
         )
-        refresh_btn.pack()
+        refresh_btn.pack(side="right")
+
+        # Shown by show_saving while background writes take a while
+        self.saving_label = tk.Label(
+            right_header,
+            text="",
+            font=("Segoe UI", 11),
+            bg=self.bg_color,
+            fg=self.muted_text
+        )
+        self.saving_label.pack(side="right", padx=(0, 15))
 
         self.content_frame = tk.Frame(content_wrapper, bg=self.bg_color)
         self.content_frame.pack(fill="both", expand=True)
 
+        # Pages are built on first visit and kept; data changes only refresh them
+        self.views = ViewManager(self.content_frame, bg=self.bg_color)
+        self.views.register("dashboard", self.build_dashboard_content, self.refresh_dashboard_content)
+        self.views.register("profile", self.build_profile_content, self.load_profile_fields)
+        self.views.register("workouts", self.build_workouts_content, self.refresh_weekly_overview)
+        self.views.register(
+            "settings",
+            self.build_settings_content,
+            lambda: self.settings_chart_plot(),
+            on_show=lambda: self.bind_settings_scroll(True),
+            on_hide=lambda: self.bind_settings_scroll(False)
+        )
+
         self.show_dashboard_content()
 
     def create_sidebar(self, parent):
@@ -1156,19 +4732,8 @@ class FitnessTrackerApp:
             button.config(bg=self.sidebar_bg, fg=self.muted_text)
 
     def refresh_content(self):
-        self.data = load_data()
-        
-        for i, btn in enumerate(self.nav_buttons):
-            if btn.cget("bg") == self.accent_color:
-                if i == 0:
-                    self.show_dashboard_content()
-                elif i == 1:
-                    self.show_profile_content()
-                elif i == 2:
-                    self.show_workouts_content()
-                elif i == 3:
-                    self.show_settings_content()
-                break
+        """Bring every page's data-bound widgets up to date (e.g. after midnight)"""
+        self.views.invalidate()
 
     def highlight_nav_button(self, index):
         for i, btn in enumerate(self.nav_buttons):
@@ -1178,8 +4743,8 @@ class FitnessTrackerApp:
                 btn.config(bg=self.sidebar_bg, fg=self.muted_text)
 
     def clear_content(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        """Drop the cached pages so each one is rebuilt from scratch when next shown"""
+        self.views.reset()
 
     def nav_hover(self, button, enter):
         if enter:
@@ -1196,10 +4761,11 @@ class FitnessTrackerApp:
 
     def show_dashboard_content(self):
         self.highlight_nav_button(0)
-        self.clear_content()
+        self.views.show("dashboard")
 
+    def build_dashboard_content(self, parent):
         # Main container with padding
-        container = tk.Frame(self.content_frame, bg=self.bg_color)
+        container = tk.Frame(parent, bg=self.bg_color)
         container.pack(fill="both", expand=True, padx=30, pady=10)
 
         # Greeting section with decorative elements
@@ -1225,22 +4791,13 @@ class FitnessTrackerApp:
         ).pack(anchor="w")
 
         # Subtitle with current date
-        current_date = date.today().strftime("%A, %B %d, %Y")
-        tk.Label(
+        self.dashboard_date_label = tk.Label(
             greeting_text,
-            text=f"{current_date} • Let's check your fitness progress",
             font=("Segoe UI", 12),
             bg=self.bg_color,
             fg=self.muted_text
-        ).pack(anchor="w", pady=(5, 0))
-
-        # Get data
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
-        today = date.today().isoformat()
-        today_workouts = [w for w in workouts if w.get("date") == today]
-
-        total_mins = sum(w.get("duration_min", 0) for w in today_workouts)
-        total_cal = sum(w.get("calories", 0) for w in today_workouts)
+        )
+        self.dashboard_date_label.pack(anchor="w", pady=(5, 0))
 
         # STATS ROW - Two columns layout
         stats_container = tk.Frame(container, bg=self.bg_color)
@@ -1296,25 +4853,25 @@ class FitnessTrackerApp:
             fg=self.muted_text
         ).pack(anchor="w")
         
-        tk.Label(
+        self.dashboard_cal_label = tk.Label(
             title_frame,
-            text=str(total_cal),
             font=("Segoe UI", 32, "bold"),
             bg=self.panel_color,
             fg=self.text_color
-        ).pack(anchor="w", pady=(5, 0))
+        )
+        self.dashboard_cal_label.pack(anchor="w", pady=(5, 0))
 
         # Progress bar with percentage
         progress_frame = tk.Frame(cal_content, bg=self.panel_color)
         progress_frame.pack(fill="x", pady=(10, 0))
         
-        tk.Label(
+        self.dashboard_cal_goal_label = tk.Label(
             progress_frame,
-            text=f"Today's goal: {int(total_cal/2000*100 if total_cal > 0 else 0)}%",
             font=("Segoe UI", 10),
             bg=self.panel_color,
             fg=self.muted_text
-        ).pack(side="left")
+        )
+        self.dashboard_cal_goal_label.pack(side="left")
         
         tk.Label(
             progress_frame,
@@ -1329,9 +4886,7 @@ class FitnessTrackerApp:
         progress_bg.pack(fill="x", pady=(5, 0))
         progress_bg.pack_propagate(False)
         
-        progress_fill = tk.Frame(progress_bg, bg="#ef4444", height=10)
-        progress_width = min(total_cal / 2000, 1) * 100
-        progress_fill.place(relwidth=progress_width, relheight=1.0)
+        self.dashboard_cal_fill = tk.Frame(progress_bg, bg="#ef4444", height=10)
 
         # Active Minutes Card (Enhanced)
         time_card = tk.Frame(
@@ -1375,25 +4930,25 @@ class FitnessTrackerApp:
             fg=self.muted_text
         ).pack(anchor="w")
         
-        tk.Label(
+        self.dashboard_mins_label = tk.Label(
             time_title_frame,
-            text=str(total_mins),
             font=("Segoe UI", 32, "bold"),
             bg=self.panel_color,
             fg=self.text_color
-        ).pack(anchor="w", pady=(5, 0))
+        )
+        self.dashboard_mins_label.pack(anchor="w", pady=(5, 0))
 
         # Progress bar with percentage
         time_progress_frame = tk.Frame(time_content, bg=self.panel_color)
         time_progress_frame.pack(fill="x", pady=(10, 0))
         
-        tk.Label(
+        self.dashboard_mins_goal_label = tk.Label(
             time_progress_frame,
-            text=f"Today's goal: {int(total_mins/60*100 if total_mins > 0 else 0)}%",
             font=("Segoe UI", 10),
             bg=self.panel_color,
             fg=self.muted_text
-        ).pack(side="left")
+        )
+        self.dashboard_mins_goal_label.pack(side="left")
         
         tk.Label(
             time_progress_frame,
@@ -1408,9 +4963,7 @@ class FitnessTrackerApp:
         time_progress_bg.pack(fill="x", pady=(5, 0))
         time_progress_bg.pack_propagate(False)
         
-        time_progress_fill = tk.Frame(time_progress_bg, bg="#3b82f6", height=10)
-        time_progress_width = min(total_mins / 60, 1) * 100
-        time_progress_fill.place(relwidth=time_progress_width, relheight=1.0)
+        self.dashboard_mins_fill = tk.Frame(time_progress_bg, bg="#3b82f6", height=10)
 
         # TODAY'S ACTIVITIES CARD
         activities_card = tk.Frame(
@@ -1443,131 +4996,16 @@ class FitnessTrackerApp:
             activebackground=self.accent_hover,
             activeforeground="white",
             relief="flat",
-            cursor="hand2",
-            command=self.show_workouts_content,
-            padx=20,
-            pady=8
-        )
-        add_btn.pack(side="right")
-
-        # Activities list container
-        activities_list = tk.Frame(activities_card, bg=self.panel_color)
-        activities_list.pack(fill="both", expand=True, padx=25, pady=(0, 25))
-
-        if today_workouts:
-            for workout in today_workouts[:5]:
-                # Activity item with enhanced design
-                activity_item = tk.Frame(
-                    activities_list,
-                    bg=self.input_bg,
-                    highlightbackground="#e5e7eb",
-                    highlightthickness=1
-                )
-                activity_item.pack(fill="x", pady=6)
-                
-                # Icon mapping with colors
-                icon_map = {
-                    "Running": ("🏃", "#10b981", "#d1fae5"), 
-                    "Cycling": ("🚴", "#3b82f6", "#dbeafe"), 
-                    "Swimming": ("🏊", "#06b6d4", "#cffafe"),
-                    "Weight Training": ("🏋️", "#f97316", "#ffedd5"), 
-                    "Yoga": ("🧘", "#8b5cf6", "#ede9fe"), 
-                    "Pilates": ("🤸", "#ec4899", "#fce7f3"),
-                    "CrossFit": ("💪", "#ef4444", "#fee2e2"), 
-                    "Boxing": ("🥊", "#eab308", "#fef9c3"), 
-                    "Dancing": ("💃", "#f472b6", "#fce7f3"),
-                    "Walking": ("🚶", "#84cc16", "#dcfce7"), 
-                    "Hiking": ("🥾", "#14b8a6", "#ccfbf1"), 
-                    "Rowing": ("🚣", "#0ea5e9", "#e0f2fe")
-                }
-                icon_data = icon_map.get(workout.get("type", ""), ("💪", "#6366f1", "#e0e7ff"))
-                icon, icon_color, bg_color = icon_data
-
-                # Icon with colored background
-                icon_container = tk.Frame(activity_item, bg=bg_color, width=50, height=50)
-                icon_container.pack_propagate(False)
-                icon_container.pack(side="left", padx=15, pady=10)
-                
-                tk.Label(
-                    icon_container,
-                    text=icon,
-                    font=("Segoe UI", 20),
-                    bg=bg_color,
-                    fg=icon_color
-                ).pack(expand=True)
-
-                # Activity details
-                details_frame = tk.Frame(activity_item, bg=self.input_bg)
-                details_frame.pack(side="left", fill="both", expand=True, padx=(0, 15), pady=10)
-
-                # Activity name and time
-                tk.Label(
-                    details_frame,
-                    text=workout.get("type", "Workout"),
-                    font=("Segoe UI", 13, "bold"),
-                    bg=self.input_bg,
-                    fg=self.text_color
-                ).pack(anchor="w")
-
-                duration = workout.get('duration_min', 0)
-                calories = workout.get('calories', 0)
-                tk.Label(
-                    details_frame,
-                    text=f"{duration} min • {calories} calories",
-                    font=("Segoe UI", 11),
-                    bg=self.input_bg,
-                    fg=self.muted_text
-                ).pack(anchor="w", pady=(2, 0))
-
-                # Stats on the right
-                stats_frame = tk.Frame(activity_item, bg=self.input_bg)
-                stats_frame.pack(side="right", padx=15, pady=10)
-
-                tk.Label(
-                    stats_frame,
-                    text=f"{calories}",
-                    font=("Segoe UI", 16, "bold"),
-                    bg=self.input_bg,
-                    fg=icon_color
-                ).pack(anchor="e")
-
-                tk.Label(
-                    stats_frame,
-                    text="calories",
-                    font=("Segoe UI", 10),
-                    bg=self.input_bg,
-                    fg=self.muted_text
-                ).pack(anchor="e")
-
-        else:
-            # Empty state with illustration
-            empty_state = tk.Frame(activities_list, bg=self.panel_color)
-            empty_state.pack(expand=True, pady=40)
-            
-            tk.Label(
-                empty_state,
-                text="📝",
-                font=("Segoe UI", 48),
-                bg=self.panel_color,
-                fg=self.muted_text
-            ).pack()
-            
-            tk.Label(
-                empty_state,
-                text="No workouts today",
-                font=("Segoe UI", 14, "bold"),
-                bg=self.panel_color,
-                fg=self.text_color,
-                pady=10
-            ).pack()
-            
-            tk.Label(
-                empty_state,
-                text="Start your fitness journey by adding your first workout!",
-                font=("Segoe UI", 11),
-                bg=self.panel_color,
-                fg=self.muted_text
-            ).pack()
+            cursor="hand2",
+            command=self.show_workouts_content,
+            padx=20,
+            pady=8
+        )
+        add_btn.pack(side="right")
+
+        # Activities list container
+        self.dashboard_activities = tk.Frame(activities_card, bg=self.panel_color)
+        self.dashboard_activities.pack(fill="both", expand=True, padx=25, pady=(0, 25))
 
         # RIGHT COLUMN - Calendar and Weekly Stats (40% width)
         right_column = tk.Frame(stats_container, bg=self.bg_color)
@@ -1667,8 +5105,16 @@ class FitnessTrackerApp:
         self.calendar_grid_container = tk.Frame(calendar_card, bg="#f8fafc")
         self.calendar_grid_container.pack(expand=True, fill="both", padx=15, pady=(0, 15))
 
-        # Create calendar grid with enhanced styling
-        self.create_calendar_grid()
+        # One canvas for the whole month; the days are drawn by refresh_dashboard_content
+        self.calendar_canvas = CalendarCanvas(
+            self.calendar_grid_container,
+            on_click=self.on_day_click,
+            bg=self.panel_color,
+            width=364,
+            height=312,
+            hover_fill="#f3f4f6"
+        )
+        self.calendar_canvas.pack(fill="both", expand=True)
 
         # Calendar footer with enhanced buttons
         calendar_footer = tk.Frame(calendar_card, bg="white")
@@ -1717,7 +5163,7 @@ class FitnessTrackerApp:
             relief="flat",
             borderwidth=0,
             cursor="hand2",
-            command=self.show_history,
+            command=self.show_history_single_window,
             padx=15,
             pady=6
         )
@@ -1776,213 +5222,334 @@ class FitnessTrackerApp:
         ).pack(side="left")
 
         # Current week label in subtle pill
-        week_start = date.today() - timedelta(days=date.today().weekday())
-        week_end = week_start + timedelta(days=6)
-        week_label = f"{week_start.strftime('%b %d')} - {week_end.strftime('%b %d')}"
-        
         week_label_frame = tk.Frame(weekly_header, bg="#f1f5f9")
         week_label_frame.pack(side="right", padx=5, pady=3)
         
-        tk.Label(
+        self.dashboard_week_label = tk.Label(
             week_label_frame,
-            text=week_label,
             font=("Segoe UI", 10),
             bg="#f1f5f9",
             fg=self.muted_text,
             padx=10,
             pady=3
-        ).pack()
+        )
+        self.dashboard_week_label.pack()
+
+        self.build_activity_heatmap(container, before=stats_container)
+
+        self.dashboard_bindings = []
+        self.refresh_dashboard_content()
+
+    def refresh_dashboard_content(self):
+        """Point the dashboard at today's signals and update its date labels and calendar"""
+        today = date.today()
+        for release in self.dashboard_bindings:
+            release()
+        self.dashboard_bindings = [
+            self.bind_workout_signal(
+                self.dashboard_cal_label, "day", today.isoformat(), self.show_today_totals
+            ),
+            self.bind_workout_signal(
+                self.dashboard_activities, "day_workouts", today.isoformat(), self.fill_today_activities
+            )
+        ]
+
+        current_date = today.strftime("%A, %B %d, %Y")
+        self.dashboard_date_label.config(text=f"{current_date} • Let's check your fitness progress")
+
+        self.create_calendar_grid()
+
+        week_start = today - timedelta(days=today.weekday())
+        week_end = week_start + timedelta(days=6)
+        self.dashboard_week_label.config(
+            text=f"{week_start.strftime('%b %d')} - {week_end.strftime('%b %d')}"
+        )
 
         # Weekly stats display in grid layout
         self.update_weekly_summary()
 
-    def create_calendar_grid(self):
-        """Create the calendar grid with clickable days"""
-        # Clear previous grid
-        for widget in self.calendar_grid_container.winfo_children():
-            widget.destroy()
+        self.dashboard_bindings.append(
+            self.bind_workout_signal(self.heatmap.canvas, "total", None, lambda count: self.draw_heatmap(), now=False)
+        )
+        self.draw_heatmap()
 
-        import calendar
-        
-        # Get workouts data
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
-        
-        # Create grid frame
-        grid_frame = tk.Frame(self.calendar_grid_container, bg=self.panel_color)
-        grid_frame.pack(fill="both", expand=True)
+    def build_activity_heatmap(self, parent, before):
+        """Year-at-a-glance heatmap card along the bottom of the dashboard"""
+        self.heatmap_year = date.today().year
+        self.heatmap_field = 0
 
-        # Configure grid
-        for i in range(6):  # Weeks
-            grid_frame.rowconfigure(i, weight=1, minsize=50)
-        for i in range(7):  # Days
-            grid_frame.columnconfigure(i, weight=1, minsize=50)
-
-        # Get calendar data
-        cal = calendar.monthcalendar(self.calendar_current_date.year, 
-                                    self.calendar_current_date.month)
-        today_date = date.today()
-
-        # Icon color mapping for workout types
-        workout_icon_colors = {
-            "Running": ("🏃", "#10b981"),
-            "Cycling": ("🚴", "#3b82f6"),
-            "Swimming": ("🏊", "#06b6d4"),
-            "Weight Training": ("🏋️", "#f97316"),
-            "Yoga": ("🧘", "#8b5cf6"),
-            "Pilates": ("🤸", "#ec4899"),
-            "CrossFit": ("💪", "#ef4444"),
-            "Boxing": ("🥊", "#eab308"),
-            "Dancing": ("💃", "#f472b6"),
-            "Walking": ("🚶", "#84cc16"),
-            "Hiking": ("🥾", "#14b8a6"),
-            "Rowing": ("🚣", "#0ea5e9")
-        }
+        heatmap_card = tk.Frame(
+            parent,
+            bg=self.panel_color,
+            highlightbackground=self.accent_color,
+            highlightthickness=1,
+            relief="flat"
+        )
+        heatmap_card.pack(side="bottom", fill="x", pady=(20, 0), before=before)
 
-        # Create each day cell
-        for week_num, week in enumerate(cal):
-            for day_num, day in enumerate(week):
-                if day == 0:
-                    # Empty cell for days not in current month
-                    tk.Frame(
-                        grid_frame,
-                        bg=self.panel_color,
-                        width=50,
-                        height=50
-                    ).grid(row=week_num, column=day_num, padx=1, pady=1, sticky="nsew")
-                    continue
-                
-                date_obj = date(self.calendar_current_date.year, 
-                               self.calendar_current_date.month, day)
-                is_today = (date_obj == today_date)
-                is_current_month = (date_obj.month == self.calendar_current_date.month)
-                day_workouts = [w for w in workouts if w.get("date") == date_obj.isoformat()]
-                has_workout = len(day_workouts) > 0
-                
-                # Create day cell with clickable frame
-                day_cell = tk.Frame(
-                    grid_frame,
-                    bg="white",
-                    highlightbackground="#e5e7eb" if is_current_month else "#f3f4f6",
-                    highlightthickness=1,
-                    cursor="hand2" if is_current_month else "arrow"
-                )
-                day_cell.grid(row=week_num, column=day_num, padx=1, pady=1, sticky="nsew")
-                
-                # Day number at top left
-                day_number = tk.Label(
-                    day_cell,
-                    text=str(day),
-                    font=("Segoe UI", 10, "bold" if is_today else "normal"),
-                    bg="white",
-                    fg=self.accent_color if is_today else ("#6b7280" if is_current_month else "#d1d5db")
+        header = tk.Frame(heatmap_card, bg=self.panel_color)
+        header.pack(fill="x", padx=20, pady=(15, 5))
+
+        tk.Label(
+            header,
+            text="🔥 Activity",
+            font=("Segoe UI", 14, "bold"),
+            bg=self.panel_color,
+            fg=self.text_color
+        ).pack(side="left")
+
+        nav = tk.Frame(header, bg=self.panel_color)
+        nav.pack(side="right")
+
+        tk.Button(
+            nav,
+            text="◀",
+            font=("Segoe UI", 10),
+            bg=self.input_bg,
+            fg=self.text_color,
+            relief="flat",
+            cursor="hand2",
+            command=lambda: self.change_heatmap_year(-1),
+            width=3
+        ).pack(side="left")
+
+        self.heatmap_year_label = tk.Label(
+            nav,
+            font=("Segoe UI", 12, "bold"),
+            bg=self.panel_color,
+            fg=self.accent_color,
+            width=6
+        )
+        self.heatmap_year_label.pack(side="left", padx=5)
+
+        tk.Button(
+            nav,
+            text="▶",
+            font=("Segoe UI", 10),
+            bg=self.input_bg,
+            fg=self.text_color,
+            relief="flat",
+            cursor="hand2",
+            command=lambda: self.change_heatmap_year(1),
+            width=3
+        ).pack(side="left")
+
+        self.heatmap_metric_btn = tk.Button(
+            header,
+            font=("Segoe UI", 10),
+            bg=self.accent_color,
+            fg="white",
+            activebackground=self.accent_hover,
+            activeforeground="white",
+            relief="flat",
+            cursor="hand2",
+            command=self.toggle_heatmap_metric,
+            padx=12,
+            pady=3
+        )
+        self.heatmap_metric_btn.pack(side="right", padx=15)
+
+        self.heatmap = YearHeatmap(
+            heatmap_card,
+            bg=self.panel_color,
+            fg=self.muted_text,
+            empty=self.input_bg,
+            palette=("#c7d2fe", "#a5b4fc", "#818cf8", "#4f46e5"),
+            on_click=self.on_day_click,
+            on_scroll=self.change_heatmap_year
+        )
+        self.heatmap.pack(padx=20, pady=(0, 15), anchor="w")
+
+    def draw_heatmap(self):
+        """Colour the heatmap for the selected year straight from the daily rollup"""
+        unit = "kcal" if self.heatmap_field == 0 else "min"
+        self.heatmap.render(self.heatmap_year, self.get_workout_rollups().days, self.heatmap_field, unit)
+        self.heatmap_year_label.config(text=str(self.heatmap_year))
+        self.heatmap_metric_btn.config(text="Calories" if self.heatmap_field == 0 else "Duration")
+
+    def change_heatmap_year(self, delta):
+        year = min(self.heatmap_year + delta, date.today().year)
+        if year != self.heatmap_year and year >= 1:
+            self.heatmap_year = year
+            self.draw_heatmap()
+
+    def toggle_heatmap_metric(self):
+        """Switch the heatmap between calories and duration"""
+        self.heatmap_field = 1 - self.heatmap_field
+        self.draw_heatmap()
+
+    def show_today_totals(self, totals):
+        """Update the calories and active-minutes cards from today's (calories, duration, sessions)"""
+        total_cal, total_mins, _ = totals
+
+        self.dashboard_cal_label.config(text=str(total_cal))
+        self.dashboard_cal_goal_label.config(
+            text=f"Today's goal: {int(total_cal/2000*100 if total_cal > 0 else 0)}%"
+        )
+        progress_width = min(total_cal / 2000, 1) * 100
+        self.dashboard_cal_fill.place(relwidth=progress_width, relheight=1.0)
+
+        self.dashboard_mins_label.config(text=str(total_mins))
+        self.dashboard_mins_goal_label.config(
+            text=f"Today's goal: {int(total_mins/60*100 if total_mins > 0 else 0)}%"
+        )
+        time_progress_width = min(total_mins / 60, 1) * 100
+        self.dashboard_mins_fill.place(relwidth=time_progress_width, relheight=1.0)
+
+    def fill_today_activities(self, today_workouts):
+        """(Re)build the Today's Activities list"""
+        for widget in self.dashboard_activities.winfo_children():
+            widget.destroy()
+
+        if today_workouts:
+            for workout in today_workouts[:5]:
+                # Activity item with enhanced design
+                activity_item = tk.Frame(
+                    self.dashboard_activities,
+                    bg=self.input_bg,
+                    highlightbackground="#e5e7eb",
+                    highlightthickness=1
                 )
-                day_number.place(x=5, y=5, anchor="nw")
-                
-                # Workout icons area (center)
-                if has_workout and is_current_month:
-                    # Get unique workout types for the day (max 3 shown)
-                    unique_workouts = []
-                    seen_types = set()
-                    for workout in day_workouts:
-                        w_type = workout.get("type", "")
-                        if w_type not in seen_types and len(unique_workouts) < 3:
-                            seen_types.add(w_type)
-                            unique_workouts.append(w_type)
-                    
-                    # Display workout icons
-                    icon_frame = tk.Frame(day_cell, bg="white")
-                    icon_frame.place(relx=0.5, rely=0.5, anchor="center")
-                    
-                    for i, w_type in enumerate(unique_workouts):
-                        icon_data = workout_icon_colors.get(w_type, ("💪", "#6366f1"))
-                        icon, color = icon_data
-                        
-                        icon_label = tk.Label(
-                            icon_frame,
-                            text=icon,
-                            font=("Segoe UI", 14),
-                            bg="white",
-                            fg=color
-                        )
-                        icon_label.pack(side="left", padx=1)
-                
-                # Workout count badge (if more than 3 workouts)
-                workout_count = len(day_workouts)
-                if workout_count > 3 and is_current_month:
-                    count_badge = tk.Label(
-                        day_cell,
-                        text=f"+{workout_count - 3}",
-                        font=("Segoe UI", 8, "bold"),
-                        bg=self.accent_color,
-                        fg="white",
-                        padx=4,
-                        pady=1
-                    )
-                    count_badge.place(relx=0.85, rely=0.15, anchor="center")
+                activity_item.pack(fill="x", pady=6)
                 
-                # Today indicator
-                if is_today:
-                    today_indicator = tk.Frame(
-                        day_cell,
-                        bg=self.accent_color,
-                        height=3
-                    )
-                    today_indicator.place(relx=0.5, rely=0.95, anchor="center", relwidth=0.8)
+                icon_data = CALENDAR_WORKOUT_ICONS.get(workout.get("type", ""), DEFAULT_WORKOUT_ICON)
+                icon, icon_color, bg_color = icon_data
+
+                # Icon with colored background
+                icon_container = tk.Frame(activity_item, bg=bg_color, width=50, height=50)
+                icon_container.pack_propagate(False)
+                icon_container.pack(side="left", padx=15, pady=10)
                 
-                # Add click functionality for current month days
-                if is_current_month:
-                    # Store date info for click event
-                    day_cell.date_obj = date_obj
-                    day_cell.day_workouts = day_workouts
-                    
-                    # Bind events
-                    day_cell.bind("<Button-1>", self.on_day_click)
-                    day_cell.bind("<Enter>", self.on_day_enter)
-                    day_cell.bind("<Leave>", self.on_day_leave)
-                    
-                    # Bind to all child widgets too
-                    for child in day_cell.winfo_children():
-                        child.bind("<Button-1>", self.on_day_click)
-                        child.bind("<Enter>", self.on_day_enter)
-                        child.bind("<Leave>", self.on_day_leave)
-
-    def on_day_click(self, event):
-        """Handle day click - show workouts for that day"""
-        # Get the day cell that was clicked
-        widget = event.widget
-        while widget and not hasattr(widget, 'date_obj'):
-            widget = widget.master
-        
-        if widget and hasattr(widget, 'date_obj'):
-            date_obj = widget.date_obj
-            day_workouts = widget.day_workouts
+                tk.Label(
+                    icon_container,
+                    text=icon,
+                    font=("Segoe UI", 20),
+                    bg=bg_color,
+                    fg=icon_color
+                ).pack(expand=True)
+
+                # Activity details
+                details_frame = tk.Frame(activity_item, bg=self.input_bg)
+                details_frame.pack(side="left", fill="both", expand=True, padx=(0, 15), pady=10)
+
+                # Activity name and time
+                tk.Label(
+                    details_frame,
+                    text=workout.get("type", "Workout"),
+                    font=("Segoe UI", 13, "bold"),
+                    bg=self.input_bg,
+                    fg=self.text_color
+                ).pack(anchor="w")
+
+                duration = workout.get('duration_min', 0)
+                calories = workout.get('calories', 0)
+                tk.Label(
+                    details_frame,
+                    text=f"{duration} min • {calories} calories",
+                    font=("Segoe UI", 11),
+                    bg=self.input_bg,
+                    fg=self.muted_text
+                ).pack(anchor="w", pady=(2, 0))
+
+                # Stats on the right
+                stats_frame = tk.Frame(activity_item, bg=self.input_bg)
+                stats_frame.pack(side="right", padx=15, pady=10)
+
+                tk.Label(
+                    stats_frame,
+                    text=f"{calories}",
+                    font=("Segoe UI", 16, "bold"),
+                    bg=self.input_bg,
+                    fg=icon_color
+                ).pack(anchor="e")
+
+                tk.Label(
+                    stats_frame,
+                    text="calories",
+                    font=("Segoe UI", 10),
+                    bg=self.input_bg,
+                    fg=self.muted_text
+                ).pack(anchor="e")
+
+        else:
+            # Empty state with illustration
+            empty_state = tk.Frame(self.dashboard_activities, bg=self.panel_color)
+            empty_state.pack(expand=True, pady=40)
+            
+            tk.Label(
+                empty_state,
+                text="📝",
+                font=("Segoe UI", 48),
+                bg=self.panel_color,
+                fg=self.muted_text
+            ).pack()
+            
+            tk.Label(
+                empty_state,
+                text="No workouts today",
+                font=("Segoe UI", 14, "bold"),
+                bg=self.panel_color,
+                fg=self.text_color,
+                pady=10
+            ).pack()
             
-            # Show workout details in a popup or switch to history
-            self.show_day_workouts(date_obj, day_workouts)
-
-    def on_day_enter(self, event):
-        """Handle mouse enter - highlight day"""
-        widget = event.widget
-        while widget and widget.cget("bg") != "white":
-            widget = widget.master
-        
-        if widget and widget.cget("bg") == "white":
-            widget.config(bg="#f3f4f6")
-            for child in widget.winfo_children():
-                if isinstance(child, tk.Label) and child.cget("bg") == "white":
-                    child.config(bg="#f3f4f6")
-
-    def on_day_leave(self, event):
-        """Handle mouse leave - restore day color"""
-        widget = event.widget
-        while widget and widget.cget("bg") != "#f3f4f6":
-            widget = widget.master
-        
-        if widget and widget.cget("bg") == "#f3f4f6":
-            widget.config(bg="white")
-            for child in widget.winfo_children():
-                if isinstance(child, tk.Label) and child.cget("bg") == "#f3f4f6":
-                    child.config(bg="white")
+            tk.Label(
+                empty_state,
+                text="Start your fitness journey by adding your first workout!",
+                font=("Segoe UI", 11),
+                bg=self.panel_color,
+                fg=self.muted_text
+            ).pack()
+
+    def create_calendar_grid(self):
+        """Draw the displayed month on the dashboard calendar canvas"""
+        # Redraw when workouts land in the month on show
+        if getattr(self, "calendar_binding", None):
+            self.calendar_binding()
+        self.calendar_binding = self.bind_workout_signal(
+            self.calendar_canvas.canvas,
+            "month",
+            self.calendar_current_date.strftime("%Y-%m"),
+            lambda totals: self.create_calendar_grid(),
+            now=False
+        )
+
+        self.calendar_today = date.today()
+        self.calendar_canvas.render(
+            self.calendar_current_date.year,
+            self.calendar_current_date.month,
+            self.describe_calendar_day
+        )
+
+    def describe_calendar_day(self, date_obj):
+        """Cell style for a day on the dashboard calendar"""
+        day_workouts = self.get_workout_index().on(date_obj)
+        is_today = (date_obj == self.calendar_today)
+
+        # Unique workout types for the day (max 3 shown)
+        icons = []
+        seen_types = set()
+        for workout in day_workouts:
+            w_type = workout.get("type", "")
+            if w_type not in seen_types and len(icons) < 3:
+                seen_types.add(w_type)
+                icons.append(CALENDAR_WORKOUT_ICONS.get(w_type, DEFAULT_WORKOUT_ICON))
+
+        return {
+            "fill": "white",
+            "outline": "#e5e7eb",
+            "fg": self.accent_color if is_today else "#6b7280",
+            "bold": is_today,
+            "icons": icons,
+            # Workout count badge (if more than 3 workouts)
+            "badge": f"+{len(day_workouts) - 3}" if len(day_workouts) > 3 else None,
+            "badge_fill": self.accent_color,
+            "marker": self.accent_color if is_today else None
+        }
+
+    def on_day_click(self, date_obj):
+        """Handle day click - show workouts for that day"""
+        self.show_day_workouts(date_obj, self.get_workout_index().on(date_obj))
 
     def show_day_workouts(self, date_obj, workouts):
         """Show workouts for a specific day"""
@@ -2084,7 +5651,6 @@ class FitnessTrackerApp:
 
     def change_calendar_month(self, delta):
         """Change calendar month by delta (+1 for next, -1 for previous)"""
-        import datetime
         current = self.calendar_current_date
         year = current.year + (current.month + delta - 1) // 12
         month = (current.month + delta - 1) % 12 + 1
@@ -2117,10 +5683,11 @@ class FitnessTrackerApp:
 
     def show_profile_content(self):
         self.highlight_nav_button(1)
-        self.clear_content()
+        self.views.show("profile")
 
+    def build_profile_content(self, parent):
     # Create main container
-        container = tk.Frame(self.content_frame, bg=self.bg_color)
+        container = tk.Frame(parent, bg=self.bg_color)
         container.pack(fill="both", expand=True, padx=20, pady=20)
 
                 # Title and Edit Button Row
@@ -2171,10 +5738,6 @@ class FitnessTrackerApp:
         landscape_frame = tk.Frame(container, bg=self.bg_color)
         landscape_frame.pack(fill="both", expand=True)
 
-        # Load user data
-        user_data = self.data.get(self.current_user, {})
-        profile_data = user_data.get("profile", {})
-
         # COLUMN 1 - Personal Info (LEFT SIDE)
         col1 = tk.Frame(landscape_frame, bg=self.bg_color)
         col1.pack(side="left", fill="both", expand=True, padx=(0, 10))
@@ -2198,7 +5761,7 @@ class FitnessTrackerApp:
         # Name
         tk.Label(personal_content, text="Full Name:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text).pack(anchor="w", pady=(0, 5))
-        self.name_var = tk.StringVar(value=profile_data.get("name", ""))
+        self.name_var = tk.StringVar()
         self.name_entry = tk.Entry(personal_content, textvariable=self.name_var, 
                                   font=("Segoe UI", 14), width=40, bg=self.input_bg)
         self.name_entry.pack(fill="x", pady=(0, 20))
@@ -2206,7 +5769,7 @@ class FitnessTrackerApp:
         # Email
         tk.Label(personal_content, text="Email:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text).pack(anchor="w", pady=(0, 5))
-        self.email_var = tk.StringVar(value=profile_data.get("email", ""))
+        self.email_var = tk.StringVar()
         self.email_entry = tk.Entry(personal_content, textvariable=self.email_var, 
                                    font=("Segoe UI", 14), width=40, bg=self.input_bg)
         self.email_entry.pack(fill="x", pady=(0, 20))
@@ -2225,7 +5788,6 @@ class FitnessTrackerApp:
             relief="solid"
         )
         self.bio_text.pack(fill="both", expand=True, pady=(0, 10))
-        self.bio_text.insert("1.0", profile_data.get("bio", ""))
 
         # COLUMN 2 - Fitness Stats (RIGHT SIDE)
         col2 = tk.Frame(landscape_frame, bg=self.bg_color)
@@ -2256,7 +5818,7 @@ class FitnessTrackerApp:
         age_frame.pack(fill="x", pady=10)
         tk.Label(age_frame, text="Age:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.age_var = tk.StringVar(value=profile_data.get("age", ""))
+        self.age_var = tk.StringVar()
         self.age_entry = tk.Entry(age_frame, textvariable=self.age_var, 
                                  font=("Segoe UI", 14), width=20, bg=self.input_bg)
         self.age_entry.pack(side="right", fill="x", expand=True)
@@ -2266,7 +5828,7 @@ class FitnessTrackerApp:
         height_frame.pack(fill="x", pady=10)
         tk.Label(height_frame, text="Height:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.height_var = tk.StringVar(value=profile_data.get("height", ""))
+        self.height_var = tk.StringVar()
         self.height_entry = tk.Entry(height_frame, textvariable=self.height_var, 
                                     font=("Segoe UI", 14), width=20, bg=self.input_bg)
         self.height_entry.pack(side="right", fill="x", expand=True)
@@ -2276,7 +5838,7 @@ class FitnessTrackerApp:
         weight_frame.pack(fill="x", pady=10)
         tk.Label(weight_frame, text="Weight:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.weight_var = tk.StringVar(value=profile_data.get("weight", ""))
+        self.weight_var = tk.StringVar()
         self.weight_entry = tk.Entry(weight_frame, textvariable=self.weight_var, 
                                     font=("Segoe UI", 14), width=20, bg=self.input_bg)
         self.weight_entry.pack(side="right", fill="x", expand=True)
@@ -2286,7 +5848,7 @@ class FitnessTrackerApp:
         bmi_frame.pack(fill="x", pady=10)
         tk.Label(bmi_frame, text="BMI:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.bmi_var = tk.StringVar(value=profile_data.get("bmi", ""))
+        self.bmi_var = tk.StringVar()
         self.bmi_entry = tk.Entry(bmi_frame, textvariable=self.bmi_var, 
                                  font=("Segoe UI", 14), width=20, bg=self.input_bg)
         self.bmi_entry.pack(side="right", fill="x", expand=True)
@@ -2296,7 +5858,7 @@ class FitnessTrackerApp:
         target_frame.pack(fill="x", pady=10)
         tk.Label(target_frame, text="Target Weight:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.target_weight_var = tk.StringVar(value=profile_data.get("target_weight", ""))
+        self.target_weight_var = tk.StringVar()
         self.target_weight_entry = tk.Entry(target_frame, textvariable=self.target_weight_var, 
                                           font=("Segoe UI", 14), width=20, bg=self.input_bg)
         self.target_weight_entry.pack(side="right", fill="x", expand=True)
@@ -2306,7 +5868,7 @@ class FitnessTrackerApp:
         activity_frame.pack(fill="x", pady=10)
         tk.Label(activity_frame, text="Activity Level:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.activity_var = tk.StringVar(value=profile_data.get("activity_level", ""))
+        self.activity_var = tk.StringVar()
         self.activity_combo = ttk.Combobox(
             activity_frame,
             textvariable=self.activity_var,
@@ -2322,7 +5884,7 @@ class FitnessTrackerApp:
         experience_frame.pack(fill="x", pady=10)
         tk.Label(experience_frame, text="Experience:", font=("Segoe UI", 14), 
                 bg=self.panel_color, fg=self.muted_text, width=15, anchor="w").pack(side="left")
-        self.experience_var = tk.StringVar(value=profile_data.get("experience", ""))
+        self.experience_var = tk.StringVar()
         self.experience_combo = ttk.Combobox(
             experience_frame,
             textvariable=self.experience_var,
@@ -2338,6 +5900,29 @@ class FitnessTrackerApp:
         fill_frame.pack(fill="both", expand=True)
 
         # Set initial state
+        self._edit_mode = False
+        self.load_profile_fields()
+
+    def load_profile_fields(self):
+        """Fill the profile form from the saved profile, unless it is being edited"""
+        if getattr(self, "_edit_mode", False):
+            return
+        profile_data = self.data.get(self.current_user, {}).get("profile", {})
+
+        self.name_var.set(profile_data.get("name", ""))
+        self.email_var.set(profile_data.get("email", ""))
+        self.age_var.set(profile_data.get("age", ""))
+        self.height_var.set(profile_data.get("height", ""))
+        self.weight_var.set(profile_data.get("weight", ""))
+        self.bmi_var.set(profile_data.get("bmi", ""))
+        self.target_weight_var.set(profile_data.get("target_weight", ""))
+        self.activity_var.set(profile_data.get("activity_level", ""))
+        self.experience_var.set(profile_data.get("experience", ""))
+
+        self.bio_text.config(state="normal")
+        self.bio_text.delete("1.0", "end")
+        self.bio_text.insert("1.0", profile_data.get("bio", ""))
+
         self.set_profile_readonly()
 
     def set_profile_readonly(self):
@@ -2463,14 +6048,15 @@ class FitnessTrackerApp:
             "experience": self.experience_var.get() if hasattr(self, 'experience_var') else ""
         }
         
-        save_data(self.data)
+        self.saves.mark_profile(self.current_user)
         messagebox.showinfo("Success", "Profile saved successfully!")
 
     def show_workouts_content(self):
         self.highlight_nav_button(2)
-        self.clear_content()
+        self.views.show("workouts")
 
-        container = tk.Frame(self.content_frame, bg=self.bg_color)
+    def build_workouts_content(self, parent):
+        container = tk.Frame(parent, bg=self.bg_color)
         container.pack(fill="both", expand=True, padx=30, pady=25)
 
         # Wide container
@@ -2686,15 +6272,11 @@ class FitnessTrackerApp:
             fg=self.text_color
         ).pack(anchor="w", pady=(0, 20))
 
-        # Stats
-        stats = [
-            ("Workouts Completed", "5"),
-            ("Total Duration", "4h 20m"),
-            ("Calories Burned", "2,850"),
-            ("Avg. Intensity", "Medium")
-        ]
+        # Stats for the current week, filled in by refresh_weekly_overview
+        self.weekly_overview_labels = []
+        stat_names = ["Workouts Completed", "Total Duration", "Calories Burned", "Avg. Intensity"]
 
-        for stat_name, stat_value in stats:
+        for stat_name in stat_names:
             stat_frame = tk.Frame(design_content1, bg=self.panel_color)
             stat_frame.pack(fill="x", pady=8)
             
@@ -2708,13 +6290,14 @@ class FitnessTrackerApp:
                 anchor="w"
             ).pack(side="left")
             
-            tk.Label(
+            value_label = tk.Label(
                 stat_frame,
-                text=stat_value,
                 font=("Segoe UI", 13, "bold"),
                 bg=self.panel_color,
                 fg=self.accent_color
-            ).pack(side="right")
+            )
+            value_label.pack(side="right")
+            self.weekly_overview_labels.append(value_label)
 
         # Design card 2
         design_card2 = tk.Frame(right_col, bg=self.panel_color, relief="flat")
@@ -2751,6 +6334,39 @@ class FitnessTrackerApp:
                 wraplength=250
             ).pack(fill="x", pady=5)       
 
+        self.refresh_weekly_overview()
+
+    def refresh_weekly_overview(self):
+        """Bind the Weekly Overview card to the current week's totals"""
+        if getattr(self, "weekly_overview_binding", None):
+            self.weekly_overview_binding()
+        week_start = date.today() - timedelta(days=date.today().weekday())
+        self.weekly_overview_binding = self.bind_workout_signal(
+            self.weekly_overview_labels[0], "week", week_start.isoformat(), self.show_weekly_overview
+        )
+
+    def show_weekly_overview(self, totals):
+        week_cal, week_mins, week_sessions = totals
+        stat_values = [
+            str(week_sessions),
+            f"{week_mins // 60}h {week_mins % 60}m",
+            f"{week_cal:,}",
+            self.describe_intensity(week_cal, week_mins)
+        ]
+        for label, stat_value in zip(self.weekly_overview_labels, stat_values):
+            label.config(text=stat_value)
+
+    def describe_intensity(self, calories, minutes):
+        """Rough intensity label from calories burned per minute"""
+        if minutes <= 0:
+            return "—"
+        per_minute = calories / minutes
+        if per_minute < 5:
+            return "Low"
+        if per_minute < 10:
+            return "Medium"
+        return "High"
+
     def save_workout(self):
         try:
             date_str = self.workout_date.get().strip()
@@ -2796,18 +6412,10 @@ class FitnessTrackerApp:
                 "created_at": datetime.utcnow().isoformat()
             }
 
-            self.data.setdefault(self.current_user, {
-                "password": "",
-                "profile": {},
-                "workouts": [],
-                "settings": {}
-            })
-            self.data[self.current_user].setdefault("workouts", []).append(workout)
-
-            save_data(self.data)
+            self.add_workouts([workout])
             messagebox.showinfo("Success", "Workout saved successfully!")
             
-            # Animate success feedback - Open larger centered analytics window
+            # Animate success feedback - Open (or raise) the larger analytics window
             self.show_charts_large()
 
             # Clear fields
@@ -2821,8 +6429,165 @@ class FitnessTrackerApp:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save workout: {str(e)}")
 
+    def get_workout_index(self, username=None):
+        """Date index for a user's workouts, built on first use"""
+        username = username or self.current_user
+        index = self.workout_indexes.get(username)
+        if index is None:
+            workouts = self.data.get(username, {}).get("workouts", [])
+            index = self.workout_indexes[username] = WorkoutIndex(workouts)
+        return index
+
+    def reset_workout_caches(self):
+        """Forget the per-user indexes, rollups and analytics; they rebuild on next use"""
+        self.workout_indexes = {}
+        self.workout_rollups = {}
+        self.workout_analytics = {}
+
+    def get_workout_analytics(self, username=None):
+        """NumPy-backed analytics for a user's workouts, built on first use"""
+        username = username or self.current_user
+        analytics = self.workout_analytics.get(username)
+        if analytics is None:
+            workouts = self.data.get(username, {}).get("workouts", [])
+            analytics = self.workout_analytics[username] = WorkoutAnalytics(workouts)
+        return analytics
+
+    def get_chart_data(self, query, on_done):
+        """Call on_done(query(aggregates)) on the Tk thread.
+
+        aggregates are SQL GROUP BY queries on SQLite and NumPy analytics
+        otherwise. The SQL runs as an io-lane task queued behind the commit of
+        any pending saves, so it sees every workout without the Tk thread
+        waiting on the disk.
+        """
+        if hasattr(self.storage, "workout_queries"):
+            self.saves.flush()
+            queries = self.storage.workout_queries(self.current_user)
+            self.tasks.submit(lambda: query(queries), on_done=on_done, lane="io", label="Loading chart")
+        else:
+            on_done(query(self.get_workout_analytics()))
+
+    def after_saves(self, callback):
+        """Queue any pending saves, then call callback() on the Tk thread once they have run"""
+        self.saves.flush()
+        self.tasks.submit(lambda: None, on_done=lambda result: callback(), lane="io", label="Saving")
+
+    def get_workout_rollups(self, username=None):
+        """Daily/weekly/monthly totals for a user's workouts, built on first use"""
+        username = username or self.current_user
+        rollups = self.workout_rollups.get(username)
+        if rollups is None:
+            workouts = self.data.get(username, {}).get("workouts", [])
+            rollups = self.workout_rollups[username] = WorkoutRollups(workouts)
+        return rollups
+
+    def add_workouts(self, workouts):
+        """Append workouts for the current user and keep indexes, rollups and storage in step"""
+        index = self.get_workout_index()
+        rollups = self.get_workout_rollups()
+        # Analytics is only built once a chart needs it; don't load NumPy just to save
+        analytics = self.workout_analytics.get(self.current_user)
+        self.data.setdefault(self.current_user, {
+            "password": "",
+            "profile": {},
+            "workouts": WorkoutLog(),
+            "settings": {}
+        })
+        # From here on everything holds the log's compact records, not the dicts passed in
+        workouts = self.data[self.current_user].setdefault("workouts", WorkoutLog()).extend(workouts)
+        index.add_many(workouts)
+        rollups.add_many(workouts)
+        if analytics is not None:
+            analytics.add_many(workouts)
+        self.saves.mark_workouts(self.current_user, workouts)
+        for listener in list(self.workout_listeners):
+            listener(self.current_user, workouts)
+
+    def show_saving(self, busy):
+        """Show or hide the header's saving indicator (debounced by the executor)"""
+        label = getattr(self, "saving_label", None)
+        if label is not None and label.winfo_exists():
+            label.config(text="💾 Saving…" if busy else "")
+
+    def prefetch_workout_analytics(self):
+        """Build the current user's chart analytics in the process pool ahead of the first chart"""
+        username = self.current_user
+        workouts = self.data.get(username, {}).get("workouts", [])
+        if username in self.workout_analytics or not workouts:
+            return
+        count = len(workouts)
+
+        def done(analytics):
+            if username in self.workout_analytics:
+                return
+            load_numpy()
+            # Fold in whatever was logged while the pool was working
+            analytics.add_many(self.data.get(username, {}).get("workouts", WorkoutLog()).added_since(count))
+            self.workout_analytics[username] = analytics
+
+        self.analytics_task = self.tasks.submit(
+            build_workout_analytics,
+            # One copy of the columns pickles as a few byte strings; a list of views
+            # would drag the whole log along with every element
+            workouts.copy(notes=False),
+            on_done=done,
+            # Not fatal: the first chart builds the analytics itself
+            on_error=lambda error: None,
+            lane="process",
+            label="Building analytics"
+        )
+
+    def subscribe_workouts(self, listener):
+        """Call listener(username, workouts) after workouts are added; returns an unsubscribe function"""
+        self.workout_listeners.append(listener)
+
+        def unsubscribe():
+            if listener in self.workout_listeners:
+                self.workout_listeners.remove(listener)
+        return unsubscribe
+
+    def resolve_workout_signal(self, username, kind, key):
+        """Current value of a WorkoutSignals signal"""
+        if kind == "day":
+            return self.get_workout_rollups(username).day(key)
+        if kind == "week":
+            return self.get_workout_rollups(username).week(key)
+        if kind == "month":
+            year, month = key.split("-")
+            return self.get_workout_rollups(username).month(int(year), int(month))
+        if kind == "day_workouts":
+            return list(self.get_workout_index(username).on(key))
+        if kind == "total":
+            return self.get_workout_index(username).count
+        raise ValueError(f"Unknown workout signal: {kind}")
+
+    def bind_workout_signal(self, widget, kind, key, callback, now=True):
+        """Bind a widget update to one of the current user's workout signals"""
+        return self.workout_signals.bind(widget, self.current_user, kind, key, callback, now)
+
+    def watch_chart(self, host):
+        """Run the host's updater whenever the current user adds workouts, until the host is released"""
+        if getattr(host, "watching", False):
+            return
+
+        def on_workouts(username, workouts):
+            if username == self.current_user and host.updater is not None:
+                host.updater(workouts)
+
+        host.on_release.append(self.subscribe_workouts(on_workouts))
+        host.watching = True
+
     def show_charts_large(self):
+        # The charts in an open window follow new workouts on their own
+        window = getattr(self, "charts_large_window", None)
+        if window is not None and window.winfo_exists():
+            window.deiconify()
+            window.lift()
+            return
+
         charts_window = tk.Toplevel(self.root)
+        self.charts_large_window = charts_window
         charts_window.title("Workout Analytics")
     
     # Larger window size
@@ -2922,64 +6687,140 @@ class FitnessTrackerApp:
         
         title = tk.Label(
             self.history_window,
-            text="📋 Workout History",
-            font=("Segoe UI", 24, "bold"),
+            text="📋 Workout History",
+            font=("Segoe UI", 24, "bold"),
+            bg=self.bg_color,
+            fg=self.text_color
+        )
+        title.pack(pady=20)
+
+        # Filter bar
+        filter_frame = tk.Frame(self.history_window, bg=self.bg_color)
+        filter_frame.pack(fill="x", padx=20)
+
+        index = self.get_workout_index()
+        types = sorted(t for t in index.type_counts if t)
+
+        filter_entries = {}
+        for key, label, width in (("start", "From", 11), ("end", "To", 11),
+                                  ("min_calories", "Min cal", 7), ("max_calories", "Max cal", 7)):
+            tk.Label(
+                filter_frame,
+                text=label,
+                font=("Segoe UI", 10),
+                bg=self.bg_color,
+                fg=self.muted_text
+            ).pack(side="left", padx=(0, 4))
+            entry = tk.Entry(
+                filter_frame,
+                font=("Segoe UI", 10),
+                bg=self.input_bg,
+                fg=self.text_color,
+                insertbackground=self.text_color,
+                width=width,
+                relief="flat"
+            )
+            entry.pack(side="left", padx=(0, 10), ipady=3)
+            filter_entries[key] = entry
+
+        tk.Label(
+            filter_frame,
+            text="Type",
+            font=("Segoe UI", 10),
+            bg=self.bg_color,
+            fg=self.muted_text
+        ).pack(side="left", padx=(0, 4))
+        type_var = tk.StringVar(value="All")
+        ttk.Combobox(
+            filter_frame,
+            textvariable=type_var,
+            values=["All"] + types,
+            font=("Segoe UI", 10),
+            width=16,
+            state="readonly"
+        ).pack(side="left", padx=(0, 10))
+
+        status_label = tk.Label(
+            self.history_window,
+            text="",
+            font=("Segoe UI", 10),
             bg=self.bg_color,
-            fg=self.text_color
+            fg=self.muted_text
         )
-        title.pack(pady=20)
 
-        # Treeview with scrollbars
+        def update_status(offset, shown, total):
+            if total:
+                status_label.config(text=f"Showing {offset + 1}–{offset + shown} of {total} workouts")
+            else:
+                status_label.config(text="No workouts match")
+
+        # Treeview that only keeps the visible rows
         tree_frame = tk.Frame(self.history_window, bg=self.bg_color)
         tree_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        grid = VirtualHistoryGrid(tree_frame, index, on_change=update_status)
+        status_label.pack()
 
-        # Create scrollbars
-        tree_scroll_y = ttk.Scrollbar(tree_frame, orient="vertical")
-        tree_scroll_x = ttk.Scrollbar(tree_frame, orient="horizontal")
+        # New workouts show up in the open grid without losing the scroll position
+        self.bind_workout_signal(grid.tree, "total", None, lambda count: grid.refresh(keep_offset=True), now=False)
 
-        tree = ttk.Treeview(
-            tree_frame,
-            columns=("date", "type", "duration", "calories", "notes"),
-            show="headings",
-            height=20,
-            yscrollcommand=tree_scroll_y.set,
-            xscrollcommand=tree_scroll_x.set
-        )
-
-        # Configure scrollbars
-        tree_scroll_y.config(command=tree.yview)
-        tree_scroll_x.config(command=tree.xview)
-
-        # Define columns
-        tree.heading("date", text="Date")
-        tree.heading("type", text="Workout Type")
-        tree.heading("duration", text="Duration")
-        tree.heading("calories", text="Calories")
-        tree.heading("notes", text="Notes")
-        
-        tree.column("date", width=120, anchor="center")
-        tree.column("type", width=150, anchor="center")
-        tree.column("duration", width=100, anchor="center")
-        tree.column("calories", width=100, anchor="center")
-        tree.column("notes", width=300, anchor="w")
-
-        # Pack tree and scrollbars
-        tree.pack(side="left", fill="both", expand=True)
-        tree_scroll_y.pack(side="right", fill="y")
-        tree_scroll_x.pack(side="bottom", fill="x")
-
-        # Load workouts
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
-        sorted_workouts = sorted(workouts, key=lambda x: x.get("date", ""), reverse=True)
-
-        for workout in sorted_workouts:
-            tree.insert("", "end", values=(
-                workout.get("date", ""),
-                workout.get("type", ""),
-                f"{workout.get('duration_min', 0)} min",
-                f"{workout.get('calories', 0)} cal",
-                workout.get("notes", "")
-            ))
+        def apply_filters():
+            def number(key):
+                value = filter_entries[key].get().strip()
+                return int(value) if value else None
+
+            def day(key):
+                # Dates compare as ISO strings, so "2024-1-5" has to be rejected, not matched
+                value = filter_entries[key].get().strip()
+                return date.fromisoformat(value).isoformat() if value else None
+            try:
+                start = day("start")
+                end = day("end")
+            except ValueError:
+                messagebox.showerror("Error", "Dates must be in YYYY-MM-DD format", parent=self.history_window)
+                return
+            try:
+                min_cal = number("min_calories")
+                max_cal = number("max_calories")
+            except ValueError:
+                messagebox.showerror("Error", "Calorie filters must be whole numbers", parent=self.history_window)
+                return
+            grid.set_filters(
+                start=start,
+                end=end,
+                workout_type=None if type_var.get() == "All" else type_var.get(),
+                min_calories=min_cal,
+                max_calories=max_cal
+            )
+
+        def reset_filters():
+            for entry in filter_entries.values():
+                entry.delete(0, tk.END)
+            type_var.set("All")
+            grid.set_filters()
+
+        tk.Button(
+            filter_frame,
+            text="Apply",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.accent_color,
+            fg="white",
+            relief="flat",
+            cursor="hand2",
+            command=apply_filters,
+            padx=12
+        ).pack(side="left", padx=(0, 5))
+
+        tk.Button(
+            filter_frame,
+            text="Reset",
+            font=("Segoe UI", 10),
+            bg=self.input_bg,
+            fg=self.text_color,
+            relief="flat",
+            cursor="hand2",
+            command=reset_filters,
+            padx=12
+        ).pack(side="left")
 
         # Button frame at bottom
         btn_frame = tk.Frame(self.history_window, bg=self.bg_color)
@@ -3025,12 +6866,25 @@ class FitnessTrackerApp:
 
     def show_settings_content(self):
         self.highlight_nav_button(3)
-        self.clear_content()
+        self.views.show("settings")
+
+    def bind_settings_scroll(self, enable):
+        """Route the mouse wheel to the settings page only while it is on screen"""
+        if not enable:
+            self.root.unbind_all("<MouseWheel>")
+            return
+
+        canvas = self.settings_canvas
 
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+
+    def build_settings_content(self, parent):
         # Create canvas and scrollbars
-        canvas = tk.Canvas(self.content_frame, bg=self.bg_color, highlightthickness=0)
-        v_scrollbar = tk.Scrollbar(self.content_frame, orient="vertical", command=canvas.yview)
-        h_scrollbar = tk.Scrollbar(self.content_frame, orient="horizontal", command=canvas.xview)
+        canvas = tk.Canvas(parent, bg=self.bg_color, highlightthickness=0)
+        v_scrollbar = tk.Scrollbar(parent, orient="vertical", command=canvas.yview)
+        h_scrollbar = tk.Scrollbar(parent, orient="horizontal", command=canvas.xview)
         scrollable_frame = tk.Frame(canvas, bg=self.bg_color)
 
         scrollable_frame.bind(
@@ -3046,10 +6900,8 @@ class FitnessTrackerApp:
         h_scrollbar.pack(side="bottom", fill="x")
         canvas.pack(side="left", fill="both", expand=True)
 
-        # Enable mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # Mousewheel scrolling is bound while the page is shown (bind_settings_scroll)
+        self.settings_canvas = canvas
 
         # Create main container (now inside scrollable_frame) - reduced padding
         main_container = tk.Frame(scrollable_frame, bg=self.bg_color)
@@ -3130,7 +6982,7 @@ class FitnessTrackerApp:
         # Export button - smaller
         export_btn = tk.Button(
             data_content,
-            text="📤 EXPORT CSV",
+            text="📤 EXPORT DATA",
             font=("Segoe UI", 11, "bold"),
             bg=self.accent_color,
             fg="white",
@@ -3143,7 +6995,7 @@ class FitnessTrackerApp:
         # Import button - smaller
         import_btn = tk.Button(
             data_content,
-            text="📥 IMPORT CSV",
+            text="📥 IMPORT DATA",
             font=("Segoe UI", 11, "bold"),
             bg=self.input_bg,
             fg=self.text_color,
@@ -3217,63 +7069,46 @@ class FitnessTrackerApp:
         chart_frame = tk.Frame(analytics_content, bg=self.panel_color)
         chart_frame.pack(fill="both", expand=True)
 
-        # Show default chart
+        # Show default chart; it is redrawn (when visible) after workouts are added
         self.plot_weekly_calories_in_settings(chart_frame)
+        self.bind_workout_signal(
+            chart_frame, "total", None, lambda count: self.views.invalidate("settings"), now=False
+        )
 
     def plot_weekly_calories_in_settings(self, frame):
-        # Clear the frame
-        for widget in frame.winfo_children():
-            widget.destroy()
+        host = ChartHost.for_frame(frame, figsize=(10, 4), toolbar=True, bg=self.panel_color)
+        self.settings_chart_plot = lambda: self.plot_weekly_calories_in_settings(frame)
 
-        # Get workout data
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
-        if not workouts:
-            tk.Label(
-                frame,
-                text="No workout data available",
+        # Weekly calories, already sorted by week
+        self.get_chart_data(
+            lambda analytics: (len(analytics), *analytics.weekly("calories")),
+            lambda result: self.draw_weekly_calories_in_settings(host, *result)
+        )
+
+    def draw_weekly_calories_in_settings(self, host, count, weeks, calories):
+        if host.figure is None:
+            return
+        if not count:
+            host.show_message(
+                "No workout data available",
                 font=("Segoe UI", 14),
-                bg=self.panel_color,
                 fg=self.muted_text
-            ).pack(expand=True, fill="both")
+            )
             return
 
-        # Calculate weekly calories
-        weekly_data = {}
-        for workout in workouts:
-            date_str = workout.get("date", "")
-            if date_str:
-                try:
-                    # Group by week
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    week_start = date_obj - timedelta(days=date_obj.weekday())
-                    week_key = week_start.strftime("%Y-%m-%d")
-                    calories = workout.get("calories", 0)
-                    weekly_data[week_key] = weekly_data.get(week_key, 0) + calories
-                except:
-                    continue
-
-        if not weekly_data:
-            tk.Label(
-                frame,
-                text="No valid workout data",
+        if not len(weeks):
+            host.show_message(
+                "No valid workout data",
                 font=("Segoe UI", 14),
-                bg=self.panel_color,
                 fg=self.muted_text
-            ).pack(expand=True, fill="both")
+            )
             return
 
-        # Create figure - LANDSCAPE ORIENTATION
-        fig, ax = plt.subplots(figsize=(10, 4))  # Wider, shorter for landscape
-        
-        # Sort weeks
-        sorted_weeks = sorted(weekly_data.keys())
-        calories = [weekly_data[week] for week in sorted_weeks]
+        # Landscape figure, reused between redraws
+        ax = host.axes()
         
         # Format week labels
-        week_labels = []
-        for week in sorted_weeks:
-            week_obj = datetime.strptime(week, "%Y-%m-%d")
-            week_labels.append(week_obj.strftime("Week %d/%m"))
+        week_labels = [week.strftime("Week %d/%m") for week in weeks.astype(object)]
         
         # Plot - horizontal bars for landscape
         bars = ax.barh(week_labels, calories, color=self.accent_color, alpha=0.8, height=0.6)
@@ -3286,90 +7121,55 @@ class FitnessTrackerApp:
             ax.text(width + (max(calories) * 0.02), bar.get_y() + bar.get_height()/2,
                     f'{int(width)}', ha='left', va='center', fontsize=10)
         
-        plt.tight_layout()
-
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        # Add toolbar
-        toolbar = NavigationToolbar2Tk(canvas, frame)
-        toolbar.update()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        host.draw()
 
     def plot_duration_in_settings(self, frame):
         """Plot duration over time chart directly in settings"""
-        # Clear the frame
-        for widget in frame.winfo_children():
-            widget.destroy()
+        host = ChartHost.for_frame(frame, figsize=(10, 5), toolbar=True, bg=self.panel_color)
+        self.settings_chart_plot = lambda: self.plot_duration_in_settings(frame)
 
-        # Get workout data
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
-        if not workouts:
-            tk.Label(
-                frame,
-                text="No workout data available",
+        # Daily duration totals in date order
+        self.get_chart_data(
+            lambda analytics: (len(analytics), *analytics.daily("duration_min")),
+            lambda result: self.draw_duration_in_settings(host, *result)
+        )
+
+    def draw_duration_in_settings(self, host, count, dates, durations):
+        if host.figure is None:
+            return
+        if not count:
+            host.show_message(
+                "No workout data available",
                 font=("Segoe UI", 14),
-                bg=self.panel_color,
                 fg=self.muted_text
-            ).pack(expand=True, fill="both")
+            )
             return
 
-        # Extract dates and durations
-        dates = []
-        durations = []
-        for workout in workouts:
-            date_str = workout.get("date", "")
-            duration = workout.get("duration_min", 0)
-            if date_str and duration > 0:
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    dates.append(date_obj)
-                    durations.append(duration)
-                except:
-                    continue
+        has_duration = durations > 0
+        dates, durations = dates[has_duration], durations[has_duration]
 
-        if not dates:
-            tk.Label(
-                frame,
-                text="No valid duration data",
+        if not len(dates):
+            host.show_message(
+                "No valid duration data",
                 font=("Segoe UI", 14),
-                bg=self.panel_color,
                 fg=self.muted_text
-            ).pack(expand=True, fill="both")
+            )
             return
 
-        # Sort by date
-        sorted_data = sorted(zip(dates, durations), key=lambda x: x[0])
-        dates_sorted, durations_sorted = zip(*sorted_data)
-
-        # Create figure
-        fig, ax = plt.subplots(figsize=(10, 5))
-
         # Plot
-        ax.plot(dates_sorted, durations_sorted, marker='o', color=self.accent_color, linewidth=2)
+        ax = host.axes()
+        ax.plot(dates.astype(object), durations, marker='o', color=self.accent_color, linewidth=2)
         ax.set_title("Workout Duration Over Time", fontsize=14, fontweight="bold")
         ax.set_xlabel("Date", fontsize=12)
         ax.set_ylabel("Duration (minutes)", fontsize=12)
+        ax.tick_params(axis="x", labelrotation=45)
 
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        # Add toolbar
-        toolbar = NavigationToolbar2Tk(canvas, frame)
-        toolbar.update()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        host.draw()
 
     def toggle_dark_mode(self, value):
         self.dark_mode = value
         self.settings["dark_mode"] = value
-        save_settings(self.settings)
+        self.tasks.submit(save_settings, dict(self.settings), lane="io", label="Saving settings", busy=True)
         self.update_theme()
         messagebox.showinfo("Theme Changed", "Please restart the app to apply theme changes")
 
@@ -3378,33 +7178,272 @@ class FitnessTrackerApp:
             messagebox.showerror("Error", "Please login first")
             return
 
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
+        index = self.get_workout_index()
 
-        if not workouts:
+        if not index:
             messagebox.showinfo("No Data", "No workouts to export")
             return
 
-        default_filename = f"{self.current_user}_workouts_{date.today().isoformat()}.csv"
-        path = filedialog.asksaveasfilename(
-            title="Save workouts as CSV",
-            defaultextension=".csv",
-            initialfile=default_filename,
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        # Export options
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Export Workouts")
+        dialog.geometry("460x420")
+        dialog.configure(bg=self.bg_color)
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+
+        tk.Label(
+            dialog,
+            text="📤 Export Workouts",
+            font=("Segoe UI", 16, "bold"),
+            bg=self.bg_color,
+            fg=self.text_color
+        ).pack(pady=(15, 10))
+
+        form = tk.Frame(dialog, bg=self.bg_color)
+        form.pack(fill="x", padx=25)
+
+        range_entries = {}
+        for row, (key, label) in enumerate((("start", "From (YYYY-MM-DD)"), ("end", "To (YYYY-MM-DD)"))):
+            tk.Label(
+                form,
+                text=label,
+                font=("Segoe UI", 10),
+                bg=self.bg_color,
+                fg=self.muted_text
+            ).grid(row=row, column=0, sticky="w", pady=4)
+            entry = tk.Entry(
+                form,
+                font=("Segoe UI", 10),
+                bg=self.input_bg,
+                fg=self.text_color,
+                insertbackground=self.text_color,
+                width=20,
+                relief="flat"
+            )
+            entry.grid(row=row, column=1, sticky="w", padx=10, pady=4, ipady=3)
+            range_entries[key] = entry
+
+        tk.Label(
+            form,
+            text="Workout type",
+            font=("Segoe UI", 10),
+            bg=self.bg_color,
+            fg=self.muted_text
+        ).grid(row=2, column=0, sticky="w", pady=4)
+        type_var = tk.StringVar(value="All")
+        ttk.Combobox(
+            form,
+            textvariable=type_var,
+            values=["All"] + sorted(t for t in index.type_counts if t),
+            font=("Segoe UI", 10),
+            width=18,
+            state="readonly"
+        ).grid(row=2, column=1, sticky="w", padx=10, pady=4)
+
+        tk.Label(
+            dialog,
+            text="Columns",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.bg_color,
+            fg=self.text_color
+        ).pack(anchor="w", padx=25, pady=(10, 2))
+
+        columns_frame = tk.Frame(dialog, bg=self.bg_color)
+        columns_frame.pack(fill="x", padx=25)
+        column_vars = {}
+        for i, field in enumerate(WORKOUT_FIELDS):
+            var = tk.BooleanVar(value=True)
+            tk.Checkbutton(
+                columns_frame,
+                text=field,
+                variable=var,
+                font=("Segoe UI", 10),
+                bg=self.bg_color,
+                fg=self.text_color,
+                selectcolor=self.input_bg,
+                activebackground=self.bg_color
+            ).grid(row=i // 3, column=i % 3, sticky="w", padx=(0, 10))
+            column_vars[field] = var
+
+        format_frame = tk.Frame(dialog, bg=self.bg_color)
+        format_frame.pack(fill="x", padx=25, pady=(10, 0))
+        format_var = tk.StringVar(value="csv")
+        for value, text in (("csv", "CSV"), ("parquet", "Parquet"), ("arrow", "Arrow")):
+            tk.Radiobutton(
+                format_frame,
+                text=text,
+                variable=format_var,
+                value=value,
+                font=("Segoe UI", 10),
+                bg=self.bg_color,
+                fg=self.text_color,
+                selectcolor=self.input_bg,
+                activebackground=self.bg_color
+            ).pack(side="left", padx=(0, 10))
+
+        gzip_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            format_frame,
+            text="gzip (CSV only)",
+            variable=gzip_var,
+            font=("Segoe UI", 10),
+            bg=self.bg_color,
+            fg=self.text_color,
+            selectcolor=self.input_bg,
+            activebackground=self.bg_color
+        ).pack(side="left", padx=(10, 0))
+
+        progress_bar = ttk.Progressbar(dialog, mode="determinate", maximum=100, length=400)
+        progress_bar.pack(padx=25, pady=(15, 5))
+        status_label = tk.Label(
+            dialog,
+            text="",
+            font=("Segoe UI", 10),
+            bg=self.bg_color,
+            fg=self.muted_text
         )
+        status_label.pack()
 
-        if not path:
-            return
+        btn_frame = tk.Frame(dialog, bg=self.bg_color)
+        btn_frame.pack(pady=10)
+        state = {"job": None}
+
+        def start_export():
+            start = range_entries["start"].get().strip() or None
+            end = range_entries["end"].get().strip() or None
+            workout_type = None if type_var.get() == "All" else type_var.get()
+            columns = [field for field in WORKOUT_FIELDS if column_vars[field].get()]
+            if not columns:
+                messagebox.showerror("Error", "Select at least one column", parent=dialog)
+                return
 
-        try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                fieldnames = ["date", "type", "duration_min", "calories", "notes", "created_at"]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(workouts)
+            fmt = format_var.get()
+            compress = fmt == "csv" and gzip_var.get()
+            if fmt != "csv":
+                try:
+                    import_pyarrow()
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e), parent=dialog)
+                    return
+
+            extension = {"csv": ".csv.gz" if compress else ".csv", "parquet": ".parquet", "arrow": ".arrow"}[fmt]
+            path = filedialog.asksaveasfilename(
+                parent=dialog,
+                title="Save workouts",
+                defaultextension=extension,
+                initialfile=f"{self.current_user}_workouts_{date.today().isoformat()}{extension}",
+                filetypes=[(f"{fmt.upper()} files", f"*{extension}"), ("All files", "*.*")]
+            )
+            if not path:
+                return
 
-            messagebox.showinfo("Success", f"Exported {len(workouts)} workouts to:\n{path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+            export_btn.config(state="disabled")
+            status_label.config(text="Saving recent workouts…")
+
+            def start_job():
+                if not dialog.winfo_exists():
+                    return
+                total = self.count_workouts(start, end, workout_type)
+                rows = self.iter_workouts(start, end, workout_type)
+                if fmt == "csv":
+                    job = CsvExportJob(path, rows, columns, compress)
+                else:
+                    job = ColumnarExportJob(path, rows, columns, fmt)
+                state["job"] = job
+                job.start()
+                poll(job, total, path)
+
+            # SQLite exports stream from the database, so pending saves must land first
+            self.after_saves(start_job)
+
+        def poll(job, total, path):
+            try:
+                while True:
+                    kind, payload = job.queue.get_nowait()
+                    if kind == "progress":
+                        if total:
+                            progress_bar["value"] = payload / total * 100
+                        status_label.config(text=f"{payload} of {total} workouts written")
+                    elif kind == "done":
+                        dialog.destroy()
+                        messagebox.showinfo("Success", f"Exported {payload} workouts to:\n{path}")
+                        return
+                    elif kind == "cancelled":
+                        dialog.destroy()
+                        return
+                    elif kind == "error":
+                        dialog.destroy()
+                        messagebox.showerror("Error", f"Failed to export: {payload}")
+                        return
+            except queue.Empty:
+                pass
+            self.root.after(50, lambda: poll(job, total, path))
+
+        def cancel():
+            if state["job"] is not None and state["job"].thread.is_alive():
+                state["job"].cancel()
+            else:
+                dialog.destroy()
+
+        export_btn = tk.Button(
+            btn_frame,
+            text="Export…",
+            font=("Segoe UI", 11, "bold"),
+            bg=self.accent_color,
+            fg="white",
+            relief="flat",
+            cursor="hand2",
+            command=start_export,
+            padx=20,
+            pady=6
+        )
+        export_btn.pack(side="left", padx=5)
+
+        tk.Button(
+            btn_frame,
+            text="Cancel",
+            font=("Segoe UI", 11),
+            bg=self.input_bg,
+            fg=self.text_color,
+            relief="flat",
+            cursor="hand2",
+            command=cancel,
+            padx=20,
+            pady=6
+        ).pack(side="left", padx=5)
+        dialog.protocol("WM_DELETE_WINDOW", cancel)
+
+    def iter_workouts(self, start=None, end=None, workout_type=None):
+        """Current user's workouts in date order, streamed from storage where possible.
+
+        Storage only has committed workouts; run this from an after_saves callback.
+        """
+        if hasattr(self.storage, "iter_workouts"):
+            return self.storage.iter_workouts(self.current_user, start, end, workout_type)
+        return self.iter_indexed_workouts(self.get_workout_index(), start, end, workout_type)
+
+    @staticmethod
+    def iter_indexed_workouts(index, start=None, end=None, workout_type=None):
+        for _, workouts in index.between(start or "", end or "\uffff"):
+            for workout in list(workouts):
+                if workout_type is None or workout.get("type") == workout_type:
+                    yield workout
+
+    def get_workouts_frame(self, as_pandas=True):
+        """Current user's workouts as a typed DataFrame (or NumPy arrays) for analysis"""
+        # Returns synchronously, so wait here for pending saves (see iter_workouts)
+        self.saves.flush(wait=True)
+        return workouts_frame(self.iter_workouts(), as_pandas)
+
+    def count_workouts(self, start=None, end=None, workout_type=None):
+        index = self.get_workout_index()
+        if workout_type is None:
+            return sum(len(workouts) for _, workouts in index.between(start or "", end or "\uffff"))
+        return sum(
+            1 for _, workouts in index.between(start or "", end or "\uffff")
+            for w in workouts if w.get("type") == workout_type
+        )
 
     def import_csv(self):
         if not self.current_user:
@@ -3412,35 +7451,121 @@ class FitnessTrackerApp:
             return
 
         path = filedialog.askopenfilename(
-            title="Select CSV file to import",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            title="Select a file to import",
+            filetypes=[
+                ("CSV files", "*.csv"),
+                ("Parquet files", "*.parquet"),
+                ("Arrow files", "*.arrow *.feather"),
+                ("All files", "*.*")
+            ]
         )
 
         if not path:
             return
 
-        try:
-            imported = 0
-            with open(path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-
-                for row in reader:
-                    workout = {
-                        "date": row.get("date", ""),
-                        "type": row.get("type", ""),
-                        "duration_min": int(row.get("duration_min", 0)),
-                        "calories": int(row.get("calories", 0)),
-                        "notes": row.get("notes", ""),
-                        "created_at": row.get("created_at", datetime.utcnow().isoformat())
-                    }
-
-                    self.data[self.current_user].setdefault("workouts", []).append(workout)
-                    imported += 1
-
-            save_data(self.data)
-            messagebox.showinfo("Success", f"Imported {imported} workouts successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import: {str(e)}")
+        if columnar_format(path):
+            try:
+                import_pyarrow()
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            job = ColumnarImportJob(path)
+        else:
+            job = CsvImportJob(path)
+
+        # Progress dialog
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importing Workouts")
+        dialog.geometry("420x170")
+        dialog.configure(bg=self.bg_color)
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+
+        tk.Label(
+            dialog,
+            text=f"📥 {os.path.basename(path)}",
+            font=("Segoe UI", 12, "bold"),
+            bg=self.bg_color,
+            fg=self.text_color
+        ).pack(pady=(15, 10))
+
+        progress_bar = ttk.Progressbar(dialog, mode="determinate", maximum=100, length=360)
+        progress_bar.pack(padx=20)
+
+        status_label = tk.Label(
+            dialog,
+            text="Starting…",
+            font=("Segoe UI", 10),
+            bg=self.bg_color,
+            fg=self.muted_text
+        )
+        status_label.pack(pady=8)
+
+        tk.Button(
+            dialog,
+            text="Cancel",
+            font=("Segoe UI", 10),
+            bg=self.input_bg,
+            fg=self.text_color,
+            relief="flat",
+            cursor="hand2",
+            command=job.cancel,
+            padx=15,
+            pady=4
+        ).pack()
+        dialog.protocol("WM_DELETE_WINDOW", job.cancel)
+
+        # Batches are staged compactly and applied once at the end: one sort and
+        # merge into the user's log and one save, however the file is ordered
+        staging = WorkoutLog()
+        state = {"imported": 0}
+
+        def finish(message=None, error=None):
+            if len(staging):
+                self.add_workouts([Workout(staging, row) for row in range(len(staging))])
+            self.saves.flush()
+            if dialog.winfo_exists():
+                dialog.destroy()
+            summary = f"Imported {state['imported']} workouts"
+            if job.rejected:
+                summary += f"\n{job.rejected} rows were rejected — see:\n{job.report_path}"
+            if error:
+                messagebox.showerror("Error", f"Failed to import: {error}\n\n{summary}")
+            elif message:
+                messagebox.showinfo(message, summary)
+
+        def poll():
+            try:
+                while True:
+                    kind, payload, progress = job.queue.get_nowait()
+                    if kind == "batch":
+                        for workout in payload:
+                            staging.store(workout)
+                        state["imported"] += len(payload)
+                    elif kind == "done":
+                        finish("Success")
+                        return
+                    elif kind == "error":
+                        finish(error=payload)
+                        return
+                    progress_bar["value"] = progress * 100
+                    status_label.config(
+                        text=f"{state['imported']} imported • {job.rejected} rejected"
+                    )
+            except queue.Empty:
+                pass
+
+            if not job.thread.is_alive() and job.queue.empty():
+                # The reader has stopped and every batch it queued has been staged
+                if job.cancelled.is_set():
+                    finish("Import Cancelled")
+                else:
+                    finish(error="the reader stopped without finishing")
+                return
+            self.root.after(50, poll)
+
+        job.start()
+        self.root.after(50, poll)
 
     def show_charts(self):
         """Show charts in a new window"""
@@ -3509,74 +7634,107 @@ class FitnessTrackerApp:
         self.plot_weekly_calories(plot_area)
 
     def plot_weekly_calories(self, plot_area):
-        # Clear plot area
-        for widget in plot_area.winfo_children():
-            widget.destroy()
-
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
+        host = ChartHost.for_frame(plot_area, figsize=(8, 5), bg=self.bg_color)
+        host.updater = lambda workouts: self.plot_weekly_calories(plot_area)
+        self.watch_chart(host)
+        today = date.today()
+        self.get_chart_data(
+            lambda analytics: (
+                len(analytics), *analytics.day_range(today - timedelta(days=6), today, "calories")
+            ),
+            lambda result: self.draw_weekly_calories(host, today, *result)
+        )
 
-        if not workouts:
-            tk.Label(
-                plot_area,
-                text="No data available",
-                font=("Segoe UI", 12),
-                bg=self.bg_color,
-                fg=self.muted_text
-            ).pack(pady=50)
+    def draw_weekly_calories(self, host, today, count, days, totals):
+        if host.figure is None:
+            return
+        if not count:
+            host.show_message("No data available", fg=self.muted_text, pady=50)
             return
 
-        today = date.today()
-        days = [(today - timedelta(days=i)) for i in reversed(range(7))]
-        labels = [d.strftime("%a") for d in days]
-        totals = []
-
-        for d in days:
-            ds = d.isoformat()
-            total = sum(w.get("calories", 0) for w in workouts if w.get("date") == ds)
-            totals.append(total)
+        labels = [d.strftime("%a") for d in days.astype(object)]
 
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.bar(labels, totals, color=self.accent_color)
+        ax = host.axes()
+        bars = ax.bar(labels, totals, color=self.accent_color)
         ax.set_title("Last 7 Days - Calories Burned", fontsize=14, fontweight="bold")
         ax.set_ylabel("Calories (kcal)")
         ax.grid(axis="y", linestyle="--", alpha=0.3)
 
-        canvas = FigureCanvasTkAgg(fig, master=plot_area)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        host.animate(bars)
+        host.updater = lambda workouts: self.update_weekly_calories(host, ax, bars, today, workouts)
+        host.draw()
 
-    def plot_duration(self, plot_area):
-        # Clear plot area
-        for widget in plot_area.winfo_children():
-            widget.destroy()
+    def update_weekly_calories(self, host, ax, bars, today, workouts):
+        """Grow the bars for the days the new workouts landed on"""
+        if date.today() != today:
+            # The 7-day window has moved on; redraw it
+            self.plot_weekly_calories(host.frame)
+            return
 
-        workouts = self.data.get(self.current_user, {}).get("workouts", [])
+        rollups = self.get_workout_rollups()
+        first_day = today - timedelta(days=6)
+        changed = False
+        for day in {w.get("date", "") for w in workouts}:
+            try:
+                offset = (date.fromisoformat(day) - first_day).days
+            except (TypeError, ValueError):
+                continue
+            if 0 <= offset < len(bars):
+                bars[offset].set_height(rollups.day(day)[0])
+                changed = True
+
+        if not changed:
+            return
+        if max(bar.get_height() for bar in bars) > ax.get_ylim()[1]:
+            host.rescale(ax)
+        else:
+            host.blit()
 
-        if not workouts:
-            tk.Label(
-                plot_area,
-                text="No data available",
-                font=("Segoe UI", 12),
-                bg=self.bg_color,
-                fg=self.muted_text
-            ).pack(pady=50)
+    def plot_duration(self, plot_area):
+        host = ChartHost.for_frame(plot_area, figsize=(8, 5), bg=self.bg_color)
+        host.updater = lambda workouts: self.plot_duration(plot_area)
+        self.watch_chart(host)
+        analytics = self.get_workout_analytics()
+
+        if not len(analytics):
+            host.show_message("No data available", fg=self.muted_text, pady=50)
             return
 
-        sorted_workouts = sorted(workouts, key=lambda x: x.get("date", ""))
-        dates = [w.get("date", "") for w in sorted_workouts]
-        durations = [w.get("duration_min", 0) for w in sorted_workouts]
+        dates, durations = analytics.series("duration_min")
 
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.plot(range(len(durations)), durations, marker="o", color=self.accent_color, linewidth=2)
-        ax.set_xticks(range(len(dates)))
-        ax.set_xticklabels(dates, rotation=45, ha="right")
+        ax = host.axes()
+        days, minutes = list(dates.astype(object)), durations.tolist()
+        line, = ax.plot(days, minutes, marker="o", color=self.accent_color, linewidth=2)
+        ax.tick_params(axis="x", labelrotation=45)
         ax.set_title("Workout Duration Over Time", fontsize=14, fontweight="bold")
         ax.set_ylabel("Duration (minutes)")
         ax.grid(axis="y", linestyle="--", alpha=0.3)
 
-        canvas = FigureCanvasTkAgg(fig, master=plot_area)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        host.animate([line])
+        host.updater = lambda workouts: self.update_duration(host, ax, line, days, minutes, workouts)
+        host.draw()
+
+    def update_duration(self, host, ax, line, days, minutes, workouts):
+        """Insert the new workouts' points into the duration line in date order"""
+        first, last = days[0], days[-1]
+        added = False
+        for workout in workouts:
+            try:
+                day = date.fromisoformat(workout.get("date", ""))
+            except (TypeError, ValueError):
+                continue
+            pos = bisect.bisect_right(days, day)
+            days.insert(pos, day)
+            minutes.insert(pos, workout.get("duration_min") or 0)
+            added = True
+
+        if not added:
+            return
+        line.set_data(days, minutes)
+        if days[0] < first or days[-1] > last or max(minutes) > ax.get_ylim()[1]:
+            host.rescale(ax)
+        else:
+            host.blit()
 
     def logout(self):
     # Create a confirmation dialog
@@ -3586,10 +7744,33 @@ class FitnessTrackerApp:
     )
     
         if reply:  # If user clicked Yes
+            if not self.save_before_leaving():
+                return
+            if self.analytics_task is not None:
+                self.analytics_task.cancel()
+            # Everything is on disk now; the next login reads its user back from storage
+            self.data.clear()
+            self.reset_workout_caches()
             self.current_user = None
             self.is_logged_in = False
             self.show_login_screen()
 
+    def on_close(self):
+        """Write any pending changes before the window goes away"""
+        if self.save_before_leaving():
+            self.root.destroy()
+
+    def save_before_leaving(self):
+        """Flush pending saves, offering a retry while they fail; False means stay put"""
+        while not self.saves.flush(wait=True):
+            if not messagebox.askretrycancel(
+                "Save Failed",
+                f"Your latest changes could not be saved:\n{self.saves.failure}\n\n"
+                "They are still in memory. Retry once the problem is fixed, or cancel to keep working."
+            ):
+                return False
+        return True
+
     def open_calendar(self, entry_widget):
         # Check if calendar window already exists
         if hasattr(self, 'cal_window') and self.cal_window.winfo_exists():
@@ -3653,8 +7834,20 @@ class FitnessTrackerApp:
         next_btn.pack(side="right")
 
         # Calendar grid
-        self.cal_frame = tk.Frame(self.cal_window, bg=self.panel_color)
-        self.cal_frame.pack(padx=10, pady=5)
+        self.cal_canvas = CalendarCanvas(
+            self.cal_window,
+            on_click=lambda day: self.select_date(day.day, entry_widget),
+            bg=self.panel_color,
+            width=308,
+            height=208,
+            hover_fill=self.accent_hover,
+            number_font=("Segoe UI", 9),
+            number_anchor="center",
+            header_font=("Segoe UI", 9, "bold"),
+            header_fg=self.muted_text,
+            gap=4
+        )
+        self.cal_canvas.pack(padx=10, pady=5)
 
         self.draw_calendar(entry_widget)
 
@@ -3706,70 +7899,17 @@ class FitnessTrackerApp:
 
     def draw_calendar(self, entry_widget):
         """Draw the calendar grid"""
-        # Clear existing calendar
-        for widget in self.cal_frame.winfo_children():
-            widget.destroy()
-
-        # Day headers
-        days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for i, day in enumerate(days):
-            tk.Label(
-                self.cal_frame,
-                text=day,
-                font=("Segoe UI", 9, "bold"),
-                bg=self.panel_color,
-                fg=self.muted_text,
-                width=5
-            ).grid(row=0, column=i, padx=2, pady=2)
-
-        # Get calendar for month
-        import calendar
-        cal = calendar.monthcalendar(self.cal_year, self.cal_month)
-
         today = date.today()
 
-        # Draw dates
-        for week_num, week in enumerate(cal, start=1):
-            for day_num, day in enumerate(week):
-                if day == 0:
-                    # Empty cell
-                    tk.Label(
-                        self.cal_frame,
-                        text="",
-                        bg=self.panel_color,
-                        width=5
-                    ).grid(row=week_num, column=day_num, padx=2, pady=2)
-                else:
-                    date_obj = date(self.cal_year, self.cal_month, day)
-                    is_today = (date_obj == today)
-                    is_selected = (date_obj == self.cal_selected_date)
-
-                    # Determine button color
-                    if is_selected:
-                        bg_color = self.accent_color
-                        fg_color = "white"
-                        font_weight = "bold"
-                    elif is_today:
-                        bg_color = "#60a5fa"  # Lighter blue for today
-                        fg_color = "white"
-                        font_weight = "bold"
-                    else:
-                        bg_color = self.input_bg
-                        fg_color = self.text_color
-                        font_weight = "normal"
-
-                    btn = tk.Button(
-                        self.cal_frame,
-                        text=str(day),
-                        font=("Segoe UI", 9, font_weight),
-                        bg=bg_color,
-                        fg=fg_color,
-                        relief="flat",
-                        cursor="hand2",
-                        command=lambda d=day: self.select_date(d, entry_widget),
-                        width=5
-                    )
-                    btn.grid(row=week_num, column=day_num, padx=2, pady=2)
+        def describe(date_obj):
+            # Determine cell color
+            if date_obj == self.cal_selected_date:
+                return {"fill": self.accent_color, "fg": "white", "bold": True}
+            if date_obj == today:
+                return {"fill": "#60a5fa", "fg": "white", "bold": True}  # Lighter blue for today
+            return {"fill": self.input_bg, "fg": self.text_color, "bold": False}
+
+        self.cal_canvas.render(self.cal_year, self.cal_month, describe)
 
     def change_month(self, delta, cal_window, entry_widget):
         """Change the displayed month"""
@@ -3815,15 +7955,81 @@ class FitnessTrackerApp:
 
 
 if __name__ == "__main__":
-    try:
-        plt.switch_backend("TkAgg")
-    except:
-        pass
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument(
+        "--migrate-to-sqlite",
+        action="store_true",
+        help=f"copy every account from {DATA_FILE} into {DB_FILE} and exit"
+    )
+    parser.add_argument(
+        "--convert-data",
+        choices=DATA_FORMATS,
+        help=f"rewrite {DATA_FILE} and the user shards in this format, save with it from now on, and exit"
+    )
+    parser.add_argument(
+        "--bench-data-format",
+        action="store_true",
+        help=f"time saving and loading {DATA_BENCH_WORKOUTS:,} workouts as JSON and as binary, and exit"
+    )
+    parser.add_argument(
+        "--bench-memory",
+        action="store_true",
+        help=f"compare memory per workout as dicts and as compact records "
+             f"(target {MEMORY_REDUCTION_TARGET}x smaller) and exit"
+    )
+    parser.add_argument(
+        "--bench-startup",
+        action="store_true",
+        help=f"measure module import time with -X importtime (budget {STARTUP_IMPORT_BUDGET_MS} ms) and exit"
+    )
+    args = parser.parse_args()
+
+    if args.bench_startup:
+        total_ms, slowest, heavy = benchmark_startup_imports()
+        print(f"Startup imports: {total_ms:.1f} ms (budget {STARTUP_IMPORT_BUDGET_MS} ms)")
+        for name, cumulative_us in slowest:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+        if heavy:
+            print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        raise SystemExit(0 if total_ms <= STARTUP_IMPORT_BUDGET_MS and not heavy else 1)
+
+    if args.convert_data:
+        count = convert_data_files(args.convert_data)
+        settings = load_settings()
+        settings["data_format"] = args.convert_data
+        save_settings(settings)
+        print(f"Converted {count} data files to {args.convert_data}")
+        raise SystemExit(0)
+
+    if args.bench_data_format:
+        results = benchmark_data_format()
+        json_save, json_load, json_size = results["json"]
+        print(f"One account with {DATA_BENCH_WORKOUTS:,} workouts:")
+        for data_format, (save_s, load_s, size) in results.items():
+            print(f"  {data_format:<7} save {save_s * 1000:8.1f} ms  load {load_s * 1000:8.1f} ms  "
+                  f"size {size / 1024:8.1f} KiB")
+        binary_save, binary_load, binary_size = results["binary"]
+        print(f"  binary is {json_save / binary_save:.1f}x faster to save, {json_load / binary_load:.1f}x "
+              f"faster to load and {json_size / binary_size:.1f}x smaller")
+        raise SystemExit(0)
+
+    if args.bench_memory:
+        results = benchmark_workout_memory()
+        print(f"Workout memory over {MEMORY_BENCH_WORKOUTS:,} workouts, in bytes per workout:")
+        print(f"  {'':<16}{'records':>9}{'index':>9}{'total':>9}")
+        for label, key in (("dicts", "dicts"), ("compact records", "compact")):
+            records, index = results[key]
+            print(f"  {label:<16}{records:9.1f}{index:9.1f}{records + index:9.1f}")
+        ratio = sum(results["dicts"]) / sum(results["compact"])
+        print(f"  {ratio:.1f}x smaller including the index (target {MEMORY_REDUCTION_TARGET}x)")
+        raise SystemExit(0 if ratio >= MEMORY_REDUCTION_TARGET else 1)
+
+    if args.migrate_to_sqlite:
+        count = migrate_json_to_sqlite()
+        print(f"Migrated {count} users from {DATA_FILE} to {DB_FILE}")
+        raise SystemExit(0)
 
     root = tk.Tk()
     app = FitnessTrackerApp(root)
-<<<<<<< HEAD
-    root.mainloop()
-=======
     root.mainloop()
->>>>>>> 33393338362784cfa1038be07aba94c793ddeeaf
+    app.tasks.shutdown()